@@ -59,21 +59,14 @@ class BackendStack(NestedStack):
             user_pool=self.cognito.user_pool,
         )
 
-        # APIGW for workorder list
-        self.apigw_workorder = coreconstructs.CoreApiGateway(
-            self,
-            "WorkOrderApiGateway",
-            region=self.region,
-            user_pool=self.cognito.user_pool,
-        )
-
-        # Fetch WorkOrders flow
+        # Fetch WorkOrders flow, served from the shared REST API under /workorder/
         self.workorder_workflow = WorkOrderApiStack(
             self,
             "WorkOrdersAPI",
-            api_gateway=self.apigw_workorder,
+            api_gateway=self.apigw,
             dynamo_db_workorder_table=work_order_table_name,
-            dynamo_db_location_table=location_table_name
+            dynamo_db_location_table=location_table_name,
+            base_path="/workorder",
         )
 
         # Emergency Warnings flow
@@ -99,6 +92,7 @@ class BackendStack(NestedStack):
             user_pool=self.cognito.user_pool.user_pool_id,
             client_id=self.cognito.user_pool_client.user_pool_client_id,
             work_order_table_name=work_order_table_name,
+            location_table_name=location_table_name,
             # Framework deployment flags
             deploy_bedrock_agents=deploy_bedrock_agents,
             deploy_strands_agents=deploy_strands_agents
@@ -106,59 +100,28 @@ class BackendStack(NestedStack):
 
         # Store outputs as properties for easy access by the frontend stack
         self.api_endpoint = self.apigw.rest_api.url
-        self.workorder_api_endpoint = self.apigw_workorder.rest_api.url
+        self.workorder_api_endpoint = f"{self.api_endpoint}workorder/"
         self.websocket_api_endpoint = self.websocket_api_stack.websocket_api_endpoint
         self.region_name = self.region
         self.user_pool_id = self.cognito.user_pool.user_pool_id
         self.user_pool_client_id = self.cognito.user_pool_client.user_pool_client_id
         self.identity_pool_id = self.cognito.identity_pool.ref
 
-        # Export all required outputs for frontend
-        CfnOutput(
-            self,
-            "RegionName",
-            value=self.region_name,
-            export_name=f"{Stack.of(self).stack_name}RegionName",
-        )
-        
-        CfnOutput(
-            self,
-            "ApiGatewayRestApiEndpoint",
-            value=self.api_endpoint,
-            export_name=f"{Stack.of(self).stack_name}ApiEndpoint",
-        )
-        
-        CfnOutput(
-            self,
-            "WorkOrderApiEndpoint",
-            value=self.workorder_api_endpoint,
-            export_name=f"{Stack.of(self).stack_name}WorkOrderApiEndpoint",
-        )
-        
-        CfnOutput(
-            self,
-            "WebSocketApiEndpoint",
-            value=self.websocket_api_endpoint,
-            export_name=f"{Stack.of(self).stack_name}WebSocketApiEndpoint",
-        )
-        
-        CfnOutput(
-            self,
-            "CognitoUserPoolId",
-            value=self.user_pool_id,
-            export_name=f"{Stack.of(self).stack_name}UserPoolId",
-        )
-        
-        CfnOutput(
-            self,
-            "CognitoUserPoolClientId",
-            value=self.user_pool_client_id,
-            export_name=f"{Stack.of(self).stack_name}UserPoolClientId",
-        )
-        
-        CfnOutput(
-            self,
-            "CognitoIdentityPoolId",
-            value=self.identity_pool_id,
-            export_name=f"{Stack.of(self).stack_name}IdentityPoolId",
-        )
+        # Export all required outputs for frontend as (value, export suffix)
+        outputs = {
+            "RegionName": (self.region_name, "RegionName"),
+            "ApiGatewayRestApiEndpoint": (self.api_endpoint, "ApiEndpoint"),
+            "WorkOrderApiEndpoint": (self.workorder_api_endpoint, "WorkOrderApiEndpoint"),
+            "WebSocketApiEndpoint": (self.websocket_api_endpoint, "WebSocketApiEndpoint"),
+            "CognitoUserPoolId": (self.user_pool_id, "UserPoolId"),
+            "CognitoUserPoolClientId": (self.user_pool_client_id, "UserPoolClientId"),
+            "CognitoIdentityPoolId": (self.identity_pool_id, "IdentityPoolId"),
+        }
+        stack_name = Stack.of(self).stack_name
+        for output_id, (value, export_suffix) in outputs.items():
+            CfnOutput(
+                self,
+                output_id,
+                value=value,
+                export_name=f"{stack_name}{export_suffix}",
+            )
@@ -2,9 +2,11 @@ import os
 
 from aws_cdk import (
     Stack,
+    ArnFormat,
     aws_iam as iam,
     aws_lambda as lambda_,
     aws_lambda_python_alpha as lambda_python,
+    DockerVolume,
     CfnOutput,
     Names,
     Duration,
@@ -20,6 +22,26 @@ import core_constructs as core
 
 from cdk_nag import NagSuppressions, NagPackSuppression
 
+# Static IAM action lists for the WebSocket handler policy
+_DDB_ACTIONS = (
+    "dynamodb:BatchGetItem",
+    "dynamodb:GetItem",
+    "dynamodb:Query",
+    "dynamodb:Scan",
+    "dynamodb:PutItem",
+    "dynamodb:UpdateItem",
+    "dynamodb:DeleteItem",
+)
+_LOG_ACTIONS = (
+    "logs:CreateLogStream",
+    "logs:PutLogEvents",
+)
+_COGNITO_ACTIONS = (
+    "cognito-idp:DescribeUserPool",
+    "cognito-idp:DescribeUserPoolClient",
+    "cognito-idp:GetJWKS",
+)
+
 class WebSocketApiStack(Construct):
 
     def __init__(
@@ -37,12 +59,16 @@ class WebSocketApiStack(Construct):
         user_pool: str = None,
         client_id: str = None,
         work_order_table_name: str = None,
+        location_table_name: str = None,
         # Framework deployment flags
         deploy_bedrock_agents: str = "no",
         deploy_strands_agents: str = "no",
     ) -> None:
         super().__init__(scope, construct_id)
 
+        # Resolve the stack once and reuse it for every ARN below
+        stack = Stack.of(self)
+
         # Validate that at least one framework is configured
         if deploy_bedrock_agents != "yes" and deploy_strands_agents != "yes":
             raise ValueError("At least one agent framework must be deployed")
@@ -61,7 +87,7 @@ class WebSocketApiStack(Construct):
         # Define function name first
         function_name = f"{construct_id.lower()}-safety-check"
         
-        # Create explicit log group for emergency check request function
+        # Create explicit log group for the WebSocket handler so it is removed with the stack
         safety_check_log_group = logs.LogGroup(
             self,
             "SafetyCheckLogGroup",
@@ -69,6 +95,57 @@ class WebSocketApiStack(Construct):
             retention=logs.RetentionDays.ONE_WEEK,
             removal_policy=RemovalPolicy.DESTROY
         )
+
+        # Build the Lambda environment once, keeping only the variables that are set
+        deploy_bedrock = deploy_bedrock_agents == "yes"
+        deploy_strands = deploy_strands_agents == "yes"
+        raw_environment = {
+            "WS_CONNECTION_TABLE_NAME": web_socket_table.table_name,
+            "CLIENT_ID": client_id,
+            "USER_POOL_ID": user_pool,
+            "REGION": region,
+            # Bedrock Agent configuration (only when the framework is deployed)
+            "BEDROCK_AGENT_ID": bedrock_agent_id if deploy_bedrock else None,
+            "BEDROCK_AGENT_ALIAS_ID": bedrock_agent_alias_id if deploy_bedrock else None,
+            # Strands Agent configuration (only when the framework is deployed)
+            "STRANDS_AGENT_ID": strands_agent_id if deploy_strands else None,
+            "STRANDS_AGENT_ALIAS_ID": strands_agent_alias_id if deploy_strands else None,
+            # Shared configuration
+            "WORK_ORDERS_TABLE_NAME": work_order_table_name,
+            "LOCATIONS_TABLE_NAME": location_table_name,
+            # Framework deployment flags
+            "DEPLOY_BEDROCK_AGENTS": deploy_bedrock_agents,
+            "DEPLOY_STRANDS_AGENTS": deploy_strands_agents,
+            # Open AWS client connections during Lambda init
+            "WARM_ON_INIT": "1",
+            # Default framework (for backward compatibility)
+            "AGENT_FRAMEWORK": "StrandsSDK" if deploy_strands else "BedrockAgent",
+        }
+        web_socket_fn_environment = {k: v for k, v in raw_environment.items() if v}
+
+        # Install the layer dependencies from a local wheelhouse when one has been
+        # prepared (see README), so bundling does not download from PyPI
+        wheelhouse_dir = os.path.abspath(
+            f"{os.path.dirname(os.path.realpath(__file__))}/../../.wheelhouse"
+        )
+        layer_bundling = None
+        if os.path.isdir(wheelhouse_dir):
+            layer_bundling = lambda_python.BundlingOptions(
+                volumes=[DockerVolume(host_path=wheelhouse_dir, container_path="/wheels")],
+                environment={"PIP_NO_INDEX": "1", "PIP_FIND_LINKS": "/wheels"},
+            )
+
+        # Third-party dependencies are bundled once into a layer so function
+        # code changes do not trigger a fresh pip install on every synth
+        web_socket_deps_layer = lambda_python.PythonLayerVersion(
+            self,
+            "WebSocketDepsLayer",
+            entry=f"{os.path.dirname(os.path.realpath(__file__))}/layer",
+            compatible_runtimes=[lambda_.Runtime.PYTHON_3_13],
+            description="Third-party dependencies for the WebSocket handler",
+            bundling=layer_bundling,
+        )
+
         # a lambda function process the customer's question
         web_socket_fn = lambda_python.PythonFunction(
             self,
@@ -80,40 +157,27 @@ class WebSocketApiStack(Construct):
             runtime=lambda_.Runtime.PYTHON_3_13,
             timeout=Duration.seconds(180),
             memory_size=512,
-            environment={
-                "WS_CONNECTION_TABLE_NAME": web_socket_table.table_name,
-                "CLIENT_ID": client_id,
-                "USER_POOL_ID": user_pool,
-                "REGION": region,
-                # Bedrock Agent configuration
-                "BEDROCK_AGENT_ID": bedrock_agent_id or "",
-                "BEDROCK_AGENT_ALIAS_ID": bedrock_agent_alias_id or "",
-                # Strands Agent configuration
-                "STRANDS_AGENT_ID": strands_agent_id or "",
-                "STRANDS_AGENT_ALIAS_ID": strands_agent_alias_id or "",
-                # Shared configuration
-                "WORK_ORDERS_TABLE_NAME": work_order_table_name,
-                # Framework deployment flags
-                "DEPLOY_BEDROCK_AGENTS": deploy_bedrock_agents,
-                "DEPLOY_STRANDS_AGENTS": deploy_strands_agents,
-                # Default framework (for backward compatibility)
-                "AGENT_FRAMEWORK": "StrandsSDK" if deploy_strands_agents == "yes" else "BedrockAgent",
-            },
-        )
-        web_socket_fn.node.add_dependency(safety_check_log_group)
-        web_socket_fn_policy = iam.Policy(
-            self, 
-            "WebSocketFnPolicy",
-            # IAM policies don't have a removal policy
+            environment=web_socket_fn_environment,
+            layers=[web_socket_deps_layer],
+            log_group=safety_check_log_group,
         )
 
         # Create ARNs for the resources
-        user_pool_arn = f"arn:aws:cognito-idp:{region}:{Stack.of(self).account}:userpool/{user_pool}"
+        user_pool_arn = stack.format_arn(
+            service="cognito-idp",
+            region=region,
+            resource="userpool",
+            resource_name=user_pool,
+            arn_format=ArnFormat.SLASH_RESOURCE_NAME,
+        )
         
+        # Collect statements and create the policy with all of them at once
+        policy_statements = []
+
         # Add permissions based on deployed frameworks
         if deploy_strands_agents == "yes" and strands_agent_alias_id:
-            # For Strands, strands_agent_alias_id is the function ARN
-            web_socket_fn_policy.add_statements(
+            # For Strands, strands_agent_alias_id is the supervisor's live alias ARN
+            policy_statements.append(
                 iam.PolicyStatement(
                     sid="StrandsLambdaInvokeAccess",
                     effect=iam.Effect.ALLOW,
@@ -126,9 +190,21 @@ class WebSocketApiStack(Construct):
             
         if deploy_bedrock_agents == "yes" and bedrock_agent_id:
             # For Bedrock Agents
-            bedrock_agent_arn = f"arn:aws:bedrock:{region}:{Stack.of(self).account}:agent/{bedrock_agent_id}"
-            bedrock_agent_alias_arn = f"arn:aws:bedrock:{region}:{Stack.of(self).account}:agent-alias/{bedrock_agent_id}/{bedrock_agent_alias_id}"
-            web_socket_fn_policy.add_statements(
+            bedrock_agent_arn = stack.format_arn(
+                service="bedrock",
+                region=region,
+                resource="agent",
+                resource_name=bedrock_agent_id,
+                arn_format=ArnFormat.SLASH_RESOURCE_NAME,
+            )
+            bedrock_agent_alias_arn = stack.format_arn(
+                service="bedrock",
+                region=region,
+                resource="agent-alias",
+                resource_name=f"{bedrock_agent_id}/{bedrock_agent_alias_id}",
+                arn_format=ArnFormat.SLASH_RESOURCE_NAME,
+            )
+            policy_statements.extend([
                 iam.PolicyStatement(
                     sid="BedrockAgentAccess",
                     effect=iam.Effect.ALLOW,
@@ -149,49 +225,61 @@ class WebSocketApiStack(Construct):
                     ],
                     resources=["arn:aws:bedrock:*::foundation-model/*"],
                 ),
-            )
+            ])
         
-        web_socket_fn_policy.add_statements(
+        work_order_table_arn = stack.format_arn(
+            service="dynamodb",
+            region=region,
+            resource="table",
+            resource_name=work_order_table_name,
+            arn_format=ArnFormat.SLASH_RESOURCE_NAME,
+        ) if work_order_table_name else "*"
+        location_table_arn = stack.format_arn(
+            service="dynamodb",
+            region=region,
+            resource="table",
+            resource_name=location_table_name,
+            arn_format=ArnFormat.SLASH_RESOURCE_NAME,
+        ) if location_table_name else "*"
+
+        policy_statements.extend([
             iam.PolicyStatement(
                 sid="DynamoDBAccess",
                 effect=iam.Effect.ALLOW,
-                actions=[
-                    "dynamodb:BatchGetItem",
-                    "dynamodb:GetItem",
-                    "dynamodb:Query",
-                    "dynamodb:Scan",
-                    "dynamodb:PutItem",
-                    "dynamodb:UpdateItem",
-                    "dynamodb:DeleteItem"
-                ],
+                actions=list(_DDB_ACTIONS),
                 resources=[
                     web_socket_table.table_arn,
-                    f"arn:aws:dynamodb:{region}:{Stack.of(self).account}:table/{work_order_table_name}" if work_order_table_name else "*"
+                    work_order_table_arn,
                 ],
             ),
+            # Batch safety reports look up each work order's coordinates
+            iam.PolicyStatement(
+                sid="LocationsReadAccess",
+                effect=iam.Effect.ALLOW,
+                actions=["dynamodb:BatchGetItem"],
+                resources=[location_table_arn],
+            ),
             iam.PolicyStatement(
                 sid="CloudWatchLogsAccess",
                 effect=iam.Effect.ALLOW,
-                actions=[
-                    "logs:CreateLogStream",
-                    "logs:PutLogEvents",
-                ],
+                actions=list(_LOG_ACTIONS),
                 resources=[safety_check_log_group.log_group_arn],
             ),
             iam.PolicyStatement(
                 sid="CognitoAccess",
                 effect=iam.Effect.ALLOW,
-                actions=[
-                    "cognito-idp:DescribeUserPool",
-                    "cognito-idp:DescribeUserPoolClient",
-                    "cognito-idp:GetJWKS",
-                ],
+                actions=list(_COGNITO_ACTIONS),
                 resources=[user_pool_arn],
             ),
+        ])
+        web_socket_fn_policy = iam.ManagedPolicy(
+            self,
+            "WebSocketFnPolicy",
+            statements=policy_statements,
         )
 
-        # Attach the IAM policy to the Lambda function's role
-        web_socket_fn.role.attach_inline_policy(web_socket_fn_policy)
+        # Attach the managed policy to the Lambda function's role
+        web_socket_fn.role.add_managed_policy(web_socket_fn_policy)
 
         NagSuppressions.add_resource_suppressions(
             web_socket_fn_policy,
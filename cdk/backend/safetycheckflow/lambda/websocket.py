@@ -5,21 +5,32 @@ import time
 import requests
 from datetime import datetime
 import functools
+import itertools
 import traceback
 import re
+import queue
+import threading
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from boto3.dynamodb.conditions import Key
-from jose import jwt
+from jose import jwk, jwt
 from botocore.config import Config
 from aws_lambda_powertools import Logger
 import uuid
+import orjson
+
+from ddb_batch import batch_get_items
+
+# orjson encodes straight to bytes, which post_to_connection and invoke accept as-is
+def jdumps(obj):
+    return orjson.dumps(obj, default=str)
+
+jloads = orjson.loads
 
 # Initialize services and constants
 logger = Logger()
 def log(message):
     logger.info(message)
-dynamodb = boto3.resource('dynamodb')
-ws_connection_table = dynamodb.Table(os.environ['WS_CONNECTION_TABLE_NAME'])
 
 # Environment variables - Support both frameworks
 REGION = os.environ.get("REGION", "us-east-1")
@@ -36,60 +47,84 @@ STRANDS_AGENT_ALIAS_ID = os.environ.get("STRANDS_AGENT_ALIAS_ID")
 
 # Shared configuration
 WORK_ORDERS_TABLE_NAME = os.environ.get("WORK_ORDERS_TABLE_NAME")
+LOCATIONS_TABLE_NAME = os.environ.get("LOCATIONS_TABLE_NAME")
+
+# Warm-init block: every AWS client is created once per execution environment with a
+# shared config. Keepalive lets warm invocations reuse connections; urllib3 already
+# sets TCP_NODELAY on botocore sockets by default
+_SHARED_CFG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=16,
+    retries={'max_attempts': 5, 'mode': 'standard'},
+)
 
-
-
-
+dynamodb = boto3.resource('dynamodb', config=_SHARED_CFG)
+ws_connection_table = dynamodb.Table(os.environ['WS_CONNECTION_TABLE_NAME'])
 work_orders_table = dynamodb.Table(WORK_ORDERS_TABLE_NAME) if WORK_ORDERS_TABLE_NAME else None
-
-
-
-def extract_html_content(text):
-    """
-    Extract HTML content from a text string if it exists.
-    Returns the HTML content if found, otherwise returns the original text.
-    """
-    try:
-        # Look for HTML content between <html> tags
-        html_pattern = re.compile(r'<html>.*?</html>', re.DOTALL)
-        html_match = html_pattern.search(text)
-        
-        if html_match:
-            return html_match.group(0)
-        
-        # If no <html> tags, look for content between <body> tags
-        body_pattern = re.compile(r'<body>.*?</body>', re.DOTALL)
-        body_match = body_pattern.search(text)
-        
-        if body_match:
-            return body_match.group(0)
-        
-        # If no <body> tags, look for any HTML-like content with multiple tags
-        if '<div' in text and '</div>' in text:
-            # This is a simple heuristic - if there are div tags, it's likely HTML content
-            return text
-            
-        # Return original text if no HTML patterns found
-        return text
-    except Exception as e:
-        logger.error(f"Error extracting HTML content: {str(e)}")
-        return text  # Return original text on error
+locations_table = dynamodb.Table(LOCATIONS_TABLE_NAME) if LOCATIONS_TABLE_NAME else None
 
 # Initialize clients for both frameworks (both are always deployed)
-lambda_client = boto3.client('lambda', region_name=REGION)
+lambda_client = boto3.client('lambda', region_name=REGION, config=_SHARED_CFG)
 bedrock_agent_runtime_client = boto3.client(
     'bedrock-agent-runtime',
-    config=Config(
-        retries={
-            'max_attempts': 5, 
-            'mode': 'standard' 
-        },
-        read_timeout=80,       
-        connect_timeout=10,    
-        region_name= REGION 
-    )
+    config=_SHARED_CFG.merge(Config(
+        read_timeout=80,
+        connect_timeout=10,
+        region_name=REGION
+    ))
 )
 
+def warm_clients():
+    """Open the DynamoDB connection during init so the first request does not pay DNS + TLS"""
+    try:
+        ws_connection_table.get_item(Key={'connectionId': '__warmup__'})
+    except Exception as e:
+        logger.warning(f"Client warm-up failed: {str(e)}")
+
+# Only warm when asked, so tests and local runs do not make network calls at import
+if os.environ.get("WARM_ON_INIT") == "1":
+    warm_clients()
+
+# HTML extraction/cleanup patterns, compiled once at module load
+_HTML_START_TAGS = ('<div', '<html', '<body', '<section', '<h1')
+_HTML_START_RE = re.compile(r'<(?:div|html|body|section|h1)')
+_LEAD_NONHTML_RE = re.compile(r'^[^<]*(?=<)')
+_LAST_TAG_RE = re.compile(r'</[^>]+>(?=[^<]*$)')
+_WS_RE = re.compile(r'\s+')
+# Drop carriage returns, turn newlines and tabs into spaces
+_CLEAN_TABLE = str.maketrans({'\r': None, '\t': ' ', '\n': ' '})
+
+# Cognito JWKS, cached across invocations and keyed by kid
+JWKS_URL = f"https://cognito-idp.{REGION}.amazonaws.com/{USER_POOL_ID}/.well-known/jwks.json"
+JWKS_CACHE_TTL_SECONDS = 3600
+# An unknown kid refetches the key set at most this often, so unauthenticated frames
+# carrying made-up kids cannot force a JWKS download on every message
+JWKS_MIN_REFRESH_INTERVAL_SECONDS = 60
+_JWKS_CACHE = {}
+_JWKS_FETCHED_AT = 0.0
+
+# Connection entries expire 10 minutes after the last $connect refresh
+CONNECTION_TTL_SECONDS = 10 * 60
+
+# Bedrock traces are sent to the client in batches of up to this size / age
+TRACE_BATCH_SIZE = 16
+TRACE_BATCH_INTERVAL_SECONDS = 0.05
+
+# API Gateway management clients, cached per (domain_name, stage) across invocations
+_APIGW_CLIENTS = {}
+
+def get_apigw_client(domain_name, stage):
+    """Return the cached apigatewaymanagementapi client for this WebSocket endpoint"""
+    api_client = _APIGW_CLIENTS.get((domain_name, stage))
+    if api_client is None:
+        api_client = boto3.client(
+            'apigatewaymanagementapi',
+            endpoint_url=f'https://{domain_name}/{stage}',
+            config=_SHARED_CFG
+        )
+        _APIGW_CLIENTS[(domain_name, stage)] = api_client
+    return api_client
+
 def clean_html_response(raw_response):
     """
     Clean and format HTML response for proper display and storage
@@ -97,42 +132,27 @@ def clean_html_response(raw_response):
     try:
         if not raw_response:
             return ""
+
+        raw_text = raw_response if isinstance(raw_response, str) else str(raw_response)
+
+        # Fast path: already well-formed HTML with no escaped newlines needs no cleanup
+        stripped = raw_text.strip()
+        if stripped.startswith(_HTML_START_TAGS) and stripped.endswith('>') and '\\n' not in stripped:
+            return stripped
         
-        # Convert to string if not already
-        response_text = str(raw_response)
-        
-        # Remove common formatting issues
-        response_text = response_text.replace('\\n', '')  # Remove literal \n
-        response_text = response_text.replace('\n', ' ')   # Replace actual newlines with spaces
-        response_text = response_text.replace('\r', '')    # Remove carriage returns
-        response_text = response_text.replace('\t', ' ')   # Replace tabs with spaces
-        
-        # Remove extra whitespace
-        response_text = ' '.join(response_text.split())
-        
-        # Remove trailing characters like '}]}'
-        response_text = response_text.rstrip('}])')
-        
-        # Remove leading/trailing quotes if present
-        response_text = response_text.strip('"\'')
-        
-        # Find the start of HTML content
-        html_start_patterns = ['<div', '<html', '<body', '<section', '<h1']
-        start_index = -1
-        
-        for pattern in html_start_patterns:
-            index = response_text.find(pattern)
-            if index != -1:
-                if start_index == -1 or index < start_index:
-                    start_index = index
-        
-        if start_index > 0:
-            response_text = response_text[start_index:]
+        # Remove literal \n, normalize control characters and fold whitespace in one pass,
+        # then remove trailing characters like '}]}' and leading/trailing quotes
+        response_text = _WS_RE.sub(
+            ' ', raw_text.replace('\\n', '').translate(_CLEAN_TABLE)
+        ).strip().rstrip('}])').strip('"\'')
         
-        # Remove any text before the first HTML tag
-        import re
-        # Remove any non-HTML content at the beginning
-        response_text = re.sub(r'^[^<]*(?=<)', '', response_text)
+        # Find the start of HTML content with a single scan and drop anything before it
+        start_match = _HTML_START_RE.search(response_text)
+        if start_match:
+            response_text = response_text[start_match.start():]
+        else:
+            # Remove any non-HTML content at the beginning
+            response_text = _LEAD_NONHTML_RE.sub('', response_text)
         
         # Ensure proper HTML structure
         if response_text and not response_text.startswith('<'):
@@ -140,7 +160,7 @@ def clean_html_response(raw_response):
             response_text = f'<div>{response_text}</div>'
         
         # Remove any trailing non-HTML content
-        last_tag_match = re.search(r'</[^>]+>(?=[^<]*$)', response_text)
+        last_tag_match = _LAST_TAG_RE.search(response_text)
         if last_tag_match:
             response_text = response_text[:last_tag_match.end()]
         
@@ -150,13 +170,20 @@ def clean_html_response(raw_response):
         logger.error(f"Error cleaning HTML response: {str(e)}")
         return str(raw_response) if raw_response else ""
 
-def invoke_strands_agent(payload, session_id, api_gateway_management, connection_id):
+def invoke_strands_agent(payload, session_id, api_gateway_management, connection_id, stream=True):
     """
-    Invoke Strands agent via Lambda function with direct WebSocket streaming support
+    Invoke Strands agent via Lambda function with direct WebSocket streaming support.
+    With stream=False nothing is sent to the client; the cleaned completion (or an
+    error message) is only returned, for callers that deliver results themselves
     """
+    # Frames are only sent for streaming runs
+    def notify(message, timestamp=None):
+        if stream:
+            send_to_client(api_gateway_management, connection_id, message, timestamp=timestamp)
+
     try:
         # Send initial processing message
-        send_to_client(api_gateway_management, connection_id, {
+        notify({
             'type': 'trace',
             'content': {
                 'trace': {
@@ -177,126 +204,112 @@ def invoke_strands_agent(payload, session_id, api_gateway_management, connection
             "sessionId": session_id,
             "connectionId": connection_id,
             "apiGatewayEndpoint": api_gateway_management.meta.endpoint_url,
-            "enableStreaming": True
+            "enableStreaming": stream
         }
         
         # Invoke Strands Lambda directly - it will handle streaming to WebSocket
         response = lambda_client.invoke(
             FunctionName=STRANDS_AGENT_ID,
             InvocationType='RequestResponse',
-            Payload=json.dumps(modified_payload)
+            Payload=jdumps(modified_payload)
         )
         
-        response_payload = json.loads(response['Payload'].read())
+        response_payload = jloads(response['Payload'].read())
         
         if 'error' in response_payload:
             raise Exception(response_payload['error'])
         
         # Parse response
         if response_payload.get('statusCode') == 200:
-            body = json.loads(response_payload['body'])
+            body = response_payload['body']
+            # The body is a JSON string for API Gateway compatibility; parse it only once
+            if isinstance(body, str):
+                body = jloads(body)
             
             # Handle Strands response format - extract from content array or response field
             completion = ''
             
-            # Log the full response structure for debugging
-            logger.info(f"Strands response body structure: {json.dumps(body, indent=2, default=str)}")
+            # Log only the response shape; re-serializing the whole body is expensive
+            logger.debug("Strands response body keys: %s", list(body))
             
             if 'response' in body:
                 # The response field contains the actual Strands response
                 strands_response = body['response']
-                logger.info(f"Strands response type: {type(strands_response)}")
+                logger.debug("Strands response type: %s", type(strands_response))
                 
                 # Handle different response formats
                 if isinstance(strands_response, dict):
                     # Check for content array in the response
                     if 'content' in strands_response and isinstance(strands_response['content'], list):
-                        logger.info(f"Found content array with {len(strands_response['content'])} items")
-                        # Extract text from content array
+                        logger.debug("Found content array with %d items", len(strands_response['content']))
+                        # Collect text parts and join once at the end
+                        parts = []
                         for content_item in strands_response['content']:
-                            if isinstance(content_item, dict):
-                                # Handle different content item structures
-                                if 'text' in content_item:
-                                    text_content = content_item['text']
-                                    # Ensure text_content is a string
-                                    if isinstance(text_content, str):
-                                        completion += text_content
-                                        logger.info(f"Extracted text content: {len(text_content)} characters")
-                                    else:
-                                        # Convert non-string to string
-                                        text_str = str(text_content)
-                                        completion += text_str
-                                        logger.info(f"Converted and extracted text content: {len(text_str)} characters")
-                                else:
-                                    # If no 'text' field, stringify the entire item
-                                    item_str = str(content_item)
-                                    completion += item_str
-                                    logger.info(f"Stringified content item: {len(item_str)} characters")
-                            elif isinstance(content_item, str):
-                                completion += content_item
-                                logger.info(f"Added string content item: {len(content_item)} characters")
+                            if isinstance(content_item, dict) and 'text' in content_item:
+                                text_content = content_item['text']
                             else:
-                                # Convert any other type to string
-                                item_str = str(content_item)
-                                completion += item_str
-                                logger.info(f"Converted content item to string: {len(item_str)} characters")
+                                # Plain strings are used as-is; any other item is stringified
+                                text_content = content_item
+                            parts.append(text_content if isinstance(text_content, str) else str(text_content))
+                        completion = ''.join(parts)
                     elif 'message' in strands_response:
                         message_content = strands_response['message']
                         completion = str(message_content) if not isinstance(message_content, str) else message_content
                     else:
                         # Stringify the entire response object
-                        completion = json.dumps(strands_response)
+                        completion = jdumps(strands_response).decode()
                 elif isinstance(strands_response, str):
                     completion = strands_response
                 else:
                     completion = str(strands_response)
             elif 'content' in body and isinstance(body['content'], list):
                 # Direct content array in body
+                parts = []
                 for content_item in body['content']:
                     if isinstance(content_item, dict):
-                        if content_item.get('type') == 'text' and 'text' in content_item:
+                        if 'text' in content_item:
                             text_content = content_item['text']
-                            completion += str(text_content) if not isinstance(text_content, str) else text_content
-                        elif 'text' in content_item:
-                            text_content = content_item['text']
-                            completion += str(text_content) if not isinstance(text_content, str) else text_content
+                            parts.append(text_content if isinstance(text_content, str) else str(text_content))
                     elif isinstance(content_item, str):
-                        completion += content_item
+                        parts.append(content_item)
                     else:
-                        completion += str(content_item)
+                        parts.append(str(content_item))
+                completion = ''.join(parts)
             elif 'message' in body:
                 # Alternative: message field
                 message_content = body['message']
                 completion = str(message_content) if not isinstance(message_content, str) else message_content
             else:
                 # Last resort: stringify the entire body
-                completion = json.dumps(body)
+                completion = jdumps(body).decode()
                 logger.warning(f"Using fallback response extraction: {completion[:200]}...")
             
-            logger.info(f"Final extracted completion length: {len(completion)} characters")
-            logger.info(f"Final completion preview: {completion[:200]}...")
+            logger.debug("Final completion preview: %s...", completion[:200])
             
             # Clean the HTML response before sending and storing
             cleaned_completion = clean_html_response(completion)
-            logger.info(f"Cleaned completion length: {len(cleaned_completion)} characters")
-            logger.info(f"Cleaned completion preview: {cleaned_completion[:200]}...")
+            logger.info("Strands completion: %d characters extracted, %d after cleaning",
+                        len(completion), len(cleaned_completion))
+            logger.debug("Cleaned completion preview: %s...", cleaned_completion[:200])
             
             # Send final completion using the same format as Bedrock Agent
-            request_id = f"ws-strands-{connection_id}-{int(time.time())}"
-            send_to_client(api_gateway_management, connection_id, {
+            now = time.time()
+            now_dt = datetime.fromtimestamp(now)
+            request_id = f"ws-strands-{connection_id}-{int(now)}"
+            notify({
                 'type': 'final',
                 'requestId': request_id,
                 'status': 'COMPLETED',
                 'safetyCheckResponse': cleaned_completion,  # Send cleaned response
-                'safetyCheckPerformedAt': datetime.now().isoformat(),
+                'safetyCheckPerformedAt': now_dt.isoformat(),
                 'agentFramework': 'StrandsSDK'
-            })
+            }, timestamp=str(now_dt))
             
             return cleaned_completion  # Return cleaned response for database storage
         else:
             error_msg = f"Strands agent error: {response_payload.get('body', 'Unknown error')}"
             logger.error(error_msg)
-            send_to_client(api_gateway_management, connection_id, {
+            notify({
                 'type': 'error',
                 'safetyCheckResponse': error_msg,
                 'agentFramework': 'StrandsSDK'
@@ -306,7 +319,7 @@ def invoke_strands_agent(payload, session_id, api_gateway_management, connection
     except Exception as e:
         error_msg = f"Error invoking Strands agent: {str(e)}"
         logger.error(error_msg)
-        send_to_client(api_gateway_management, connection_id, {
+        notify({
             'type': 'error',
             'safetyCheckResponse': error_msg,
             'agentFramework': 'StrandsSDK'
@@ -317,16 +330,22 @@ def invoke_strands_agent(payload, session_id, api_gateway_management, connection
 # This function was incorrectly named - it was actually a Strands function
 # The correct invoke_bedrock_agent function is defined below
             
-def invoke_bedrock_agent(payload, session_id, api_gateway_management, connection_id):
+def invoke_bedrock_agent(payload, session_id, api_gateway_management, connection_id, stream=True):
     """
-    Invoke Bedrock agent (existing implementation)
+    Invoke Bedrock agent (existing implementation). With stream=False no chunk, trace or
+    error frames are sent and traces are not requested; the completion is only returned
     """
+    # Frames are only sent for streaming runs
+    def notify(message):
+        if stream:
+            send_to_client(api_gateway_management, connection_id, message)
+
     try:
         # Validate Bedrock agent IDs
         if not BEDROCK_AGENT_ID or not BEDROCK_AGENT_ALIAS_ID:
             error_msg = f"Bedrock agent IDs not configured. BEDROCK_AGENT_ID: {BEDROCK_AGENT_ID}, BEDROCK_AGENT_ALIAS_ID: {BEDROCK_AGENT_ALIAS_ID}"
             logger.error(error_msg)
-            send_to_client(api_gateway_management, connection_id, {
+            notify({
                 'type': 'error',
                 'message': error_msg,
                 'agentFramework': 'BedrockAgent'
@@ -342,74 +361,114 @@ def invoke_bedrock_agent(payload, session_id, api_gateway_management, connection
             "agentId": BEDROCK_AGENT_ID,
             "agentAliasId": BEDROCK_AGENT_ALIAS_ID,
             "sessionId": session_id,
-            "enableTrace": True
+            "enableTrace": stream
         }
 
         # Invoke the agent API
         response = bedrock_agent_runtime_client.invoke_agent(**input_params)
 
-        completion = ""
+        # Completion chunks are collected for storage and joined once at the end
+        completion_parts = []
+
+        # Coalesce traces into batched frames instead of one post per trace
+        pending_traces = []
+        last_flush = time.monotonic()
+
+        def flush_traces():
+            nonlocal last_flush
+            if pending_traces:
+                notify({
+                    'type': 'trace_batch',
+                    'content': list(pending_traces),
+                    'agentFramework': 'BedrockAgent'
+                })
+                pending_traces.clear()
+            last_flush = time.monotonic()
         
         # Process the response chunks
         for event_item in response['completion']:
             if 'chunk' in event_item:
                 chunk = event_item['chunk']
+                # Deliver outstanding traces before the answer starts arriving
+                flush_traces()
                 if 'bytes' in chunk:
                     chunk_data = chunk['bytes'].decode('utf-8')
-                    completion += chunk_data
+                    completion_parts.append(chunk_data)
+                    # Stream the chunk so the client can render it before the final message
+                    notify({
+                        'type': 'chunk',
+                        'content': chunk_data,
+                        'agentFramework': 'BedrockAgent'
+                    })
             
             if 'trace' in event_item:
-                trace = event_item['trace']
-                timestamp = int(time.time() * 1000)
-                # Send only orchestration trace, then send to client.
-                send_to_client(api_gateway_management, connection_id, {
-                    'type': 'trace',
-                    'content': trace,
-                    'agentFramework': 'BedrockAgent'
-                })
+                pending_traces.append(event_item['trace'])
+                if (len(pending_traces) >= TRACE_BATCH_SIZE
+                        or time.monotonic() - last_flush > TRACE_BATCH_INTERVAL_SECONDS):
+                    flush_traces()
 
-        return completion
+        flush_traces()
+        # Return cleaned HTML so the final message and the stored response need no further processing
+        return clean_html_response(''.join(completion_parts))
         
     except Exception as e:
         error_msg = f"Error invoking Bedrock agent: {str(e)}"
         logger.error(error_msg)
-        send_to_client(api_gateway_management, connection_id, {
+        notify({
             'type': 'error',
             'content': error_msg,
             'agentFramework': 'BedrockAgent'
         })
         return error_msg
 
+def refresh_jwks():
+    """Fetch the Cognito JWKS and replace the cached key map"""
+    global _JWKS_FETCHED_AT
+    # Add timeout parameter to prevent hanging connections
+    response = requests.get(JWKS_URL, timeout=15)
+    response.raise_for_status()  # Raise exception for non-200 responses
+
+    keys = response.json().get("keys", [])
+    if not keys:
+        raise ValueError("No keys found in JWKS response")
+
+    # Construct the RSA public keys once here instead of on every jwt.decode
+    _JWKS_CACHE.clear()
+    _JWKS_CACHE.update({k["kid"]: jwk.construct(k, "RS256") for k in keys if "kid" in k})
+    _JWKS_FETCHED_AT = time.time()
+
+def get_signing_key(kid):
+    """
+    Return the JWKS key for kid. The key set is fetched after the TTL, or on a kid miss
+    (a rotated key) when the last fetch is older than the minimum refresh interval
+    """
+    age = time.time() - _JWKS_FETCHED_AT
+    if age > JWKS_CACHE_TTL_SECONDS or (kid not in _JWKS_CACHE and age > JWKS_MIN_REFRESH_INTERVAL_SECONDS):
+        refresh_jwks()
+    key = _JWKS_CACHE.get(kid)
+    if key is None:
+        raise ValueError(f"No matching key found for kid: {kid}")
+    return key
+
 def verify_token(token: str) -> dict:
     try:
-        url = f"https://cognito-idp.{REGION}.amazonaws.com/{USER_POOL_ID}/.well-known/jwks.json"
-        # Add timeout parameter to prevent hanging connections
-        
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()  # Raise exception for non-200 responses
-        
-        keys = response.json().get("keys", [])
-        if not keys:
-            raise ValueError("No keys found in JWKS response")
-            
         header = jwt.get_unverified_header(token)
         if not header or "kid" not in header:
             raise ValueError("Invalid token header")
-            
-        matching_keys = [k for k in keys if k.get("kid") == header.get("kid")]
-        if not matching_keys:
-            raise ValueError(f"No matching key found for kid: {header.get('kid')}")
-            
-        key = matching_keys[0]
-        
-        decoded = jwt.decode(
-            token,
-            key,
-            algorithms=["RS256"],
-            options={"verify_at_hash": False},
-            audience=CLIENT_ID,
-        )
-        return decoded
+        kid = header["kid"]
+
+        def decode(key):
+            return jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                options={"verify_at_hash": False},
+                audience=CLIENT_ID,
+            )
+
+        # A rotated key shows up as a new kid, which get_signing_key already refetches for;
+        # a bad signature on a known kid is simply rejected
+        return decode(get_signing_key(kid))
     except requests.RequestException as e:
         logger.error(f"Error fetching JWKS: {str(e)}")
         raise
@@ -420,13 +479,22 @@ def verify_token(token: str) -> dict:
 def handle_connect(connection_id):
     try:
         logger.info(f"Adding new connection entry to DynamoDB for {connection_id}")
-        ws_connection_table.put_item(
-            Item={
-                'connectionId': connection_id,
-                'ttl': int(time.time()) + 10 * 60,  # 10 minute TTL (comment says 24 hour but code was 10 min)
-                'timestamp': str(datetime.now())
-            }
-        )
+        now = time.time()
+        try:
+            # Only write when the entry is new or its TTL is more than halfway used
+            ws_connection_table.update_item(
+                Key={'connectionId': connection_id},
+                UpdateExpression='SET #t = :t, #ts = :ts',
+                ConditionExpression='attribute_not_exists(connectionId) OR #t < :threshold',
+                ExpressionAttributeNames={'#t': 'ttl', '#ts': 'timestamp'},
+                ExpressionAttributeValues={
+                    ':t': int(now) + CONNECTION_TTL_SECONDS,
+                    ':ts': str(datetime.fromtimestamp(now)),
+                    ':threshold': int(now) + CONNECTION_TTL_SECONDS // 2,
+                }
+            )
+        except ws_connection_table.meta.client.exceptions.ConditionalCheckFailedException:
+            logger.info(f"Connection entry for {connection_id} is still fresh, skipping TTL refresh")
         return {'statusCode': 200, 'body': 'Connected'}
     except Exception as e:
         logger.error(f"Connection handling error: {str(e)}")
@@ -443,10 +511,8 @@ def handle_disconnect(connection_id):
         logger.error(traceback.format_exc())
         return {'statusCode': 200, 'body': 'Disconnected'}
 
-def handle_message(api_gateway_management, connection_id, event):
+def handle_message(api_gateway_management, connection_id, event_body):
     try:
-        # Parse request body
-        event_body = json.loads(event["body"])
 
         session_id = event_body.get('session_id', str(uuid.uuid4()))
         
@@ -454,14 +520,13 @@ def handle_message(api_gateway_management, connection_id, event):
         # Generate unique request ID
         request_id = str(uuid.uuid4())
         
-        payload = json.dumps(event_body)
-
-        try:
-            workOrderDetails = event_body['workOrderDetails']
-            # Create prompt string for workorder details
-            payload = f"{json.dumps(workOrderDetails)}"    
-        except Exception as ex:
-            logger.error(f"Error in getting work order: {str(ex)}")
+        # Create prompt string for workorder details, falling back to the whole body;
+        # encoded once since both agent frameworks take the prompt as text
+        if 'workOrderDetails' in event_body:
+            payload = jdumps(event_body['workOrderDetails']).decode()
+        else:
+            logger.error("Error in getting work order: 'workOrderDetails' missing from request")
+            payload = jdumps(event_body).decode()
 
         # Get the requested framework from the frontend
         requested_framework = event_body.get('agentFramework', 'BedrockAgent')
@@ -472,25 +537,35 @@ def handle_message(api_gateway_management, connection_id, event):
         else:
             completion = invoke_bedrock_agent(payload, session_id, api_gateway_management, connection_id)
 
-        # Get current timestamp in ISO format
-        current_time = datetime.now().isoformat()
+        # Get current timestamp once and reuse it for the request ID, message and table update
+        now = time.time()
+        now_dt = datetime.fromtimestamp(now)
+        current_time = now_dt.isoformat()
+
+        # Send final completion with agent framework information. The background
+        # sender posts it while the WorkOrders update below is in flight
+        request_id = f"ws-{connection_id}-{int(now)}"
+        send_to_client(api_gateway_management, connection_id, {
+            'type': 'final',
+            'requestId': request_id,
+            'status': 'COMPLETED',
+            'safetyCheckResponse': completion,
+            'safetyCheckPerformedAt': current_time,
+            'agentFramework': requested_framework  # Use the requested framework
+        }, timestamp=str(now_dt))
+
         # Store safety check response in WorkOrders table if available
         try:
             if work_orders_table and 'workOrderDetails' in event_body:
                 work_order_id = event_body['workOrderDetails'].get('work_order_id')
                 if work_order_id:
-                    
-                    
-                    # Extract HTML content if it exists
-                    processed_response = extract_html_content(completion)
-                    
                     logger.info(f"Updating WorkOrders table for work_order_id: {work_order_id}")
                     # Update the WorkOrders table with the safety check response and timestamp
                     work_orders_table.update_item(
                         Key={'work_order_id': work_order_id},
                         UpdateExpression="set safetyCheckResponse = :r, safetyCheckPerformedAt = :p",
                         ExpressionAttributeValues={
-                            ':r': processed_response,
+                            ':r': completion,
                             ':p': current_time
                         }
                     )
@@ -506,19 +581,6 @@ def handle_message(api_gateway_management, connection_id, event):
             logger.error(traceback.format_exc())
             # Continue execution even if table update fails
 
-        # Send final completion with agent framework information
-        request_id = f"ws-{connection_id}-{int(time.time())}"
-        send_to_client(api_gateway_management, connection_id, {
-            'type': 'final',
-            'requestId': request_id,
-            'status': 'COMPLETED',
-            'safetyCheckResponse': completion,
-            'safetyCheckPerformedAt': current_time,
-            'agentFramework': requested_framework  # Use the requested framework
-        })
-        
-
-        
         return {'statusCode': 200, 'body': 'Message sent'}
                 
     except Exception as e:
@@ -526,7 +588,7 @@ def handle_message(api_gateway_management, connection_id, event):
         logger.error(traceback.format_exc())
         
         # Use the requested framework for error message
-        error_framework = event_body.get('agentFramework', 'BedrockAgent') if 'event_body' in locals() else 'BedrockAgent'
+        error_framework = event_body.get('agentFramework', 'BedrockAgent')
         
         send_to_client(api_gateway_management, connection_id, {
             'type': 'error',
@@ -537,19 +599,181 @@ def handle_message(api_gateway_management, connection_id, event):
         })
         return {'statusCode': 500, 'body': f'Failed to process message: {str(e)}'}
 
-def send_to_client(api_gateway_management, connection_id, message):
+# Batch safety reports: one non-streaming supervisor run per work order, grouped by location.
+# The whole batch has to fit in the handler's 180 s timeout: a run is only started while
+# BATCH_RUN_BUDGET_MS of that time remains, so at the typical 30-60 s per run each of the
+# parallel lanes completes about two runs, which bounds the batch size
+BATCH_MAX_PARALLEL_RUNS = 4
+BATCH_MAX_WORK_ORDERS = 2 * BATCH_MAX_PARALLEL_RUNS
+BATCH_RUN_BUDGET_MS = 60 * 1000
+
+def work_order_details(work_order, location):
+    """The same workOrderDetails shape the frontend sends for a single safety check"""
+    return {
+        'work_order_id': work_order['work_order_id'],
+        'latitude': location.get('latitude'),
+        'longitude': location.get('longitude'),
+        'target_datetime': work_order.get('scheduled_start_timestamp'),
+    }
+
+def handle_batch_message(api_gateway_management, connection_id, event_body, context):
+    """
+    Produce safety reports for several work orders at once. Each work order gets its
+    own supervisor run with the usual single workOrderDetails payload. Runs for one
+    location go back to back, so after the first the site's tool lookups come from
+    the tool caches; different locations run in parallel. The runs do not stream, so
+    no frames from concurrent runs interleave on the connection. Each report is stored
+    and sent as a batchReport message as soon as its run finishes; work orders that no
+    longer fit in the remaining invocation time are skipped and listed in batchFinal
+    """
+    request_id = f"ws-{connection_id}-batch-{int(time.time())}"
+    requested_framework = event_body.get('agentFramework', 'BedrockAgent')
+    try:
+        if not work_orders_table or not locations_table:
+            raise ValueError("WorkOrders and Locations tables must be configured")
+
+        work_order_ids = list(dict.fromkeys(event_body.get('workOrderIds') or []))
+        if not work_order_ids or len(work_order_ids) > BATCH_MAX_WORK_ORDERS:
+            raise ValueError(f"workOrderIds must contain between 1 and {BATCH_MAX_WORK_ORDERS} ids")
+
+        work_orders = batch_get_items(dynamodb, work_orders_table.name, 'work_order_id', work_order_ids)
+        missing_ids = [work_order_id for work_order_id in work_order_ids if work_order_id not in work_orders]
+        if missing_ids:
+            logger.warning(f"Work orders not found: {missing_ids}")
+
+        # location_name -> work orders at that site, in request order
+        distinct_locations = {}
+        for work_order_id in work_order_ids:
+            if work_order_id in work_orders:
+                work_order = work_orders[work_order_id]
+                distinct_locations.setdefault(work_order.get('location_name'), []).append(work_order)
+        logger.info(f"Batch of {len(work_orders)} work orders spans {len(distinct_locations)} locations")
+        locations = batch_get_items(
+            dynamodb, locations_table.name, 'location_name', [name for name in distinct_locations if name]
+        )
+
+        invoke_agent = invoke_strands_agent if requested_framework == "StrandsSDK" else invoke_bedrock_agent
+
+        def deliver_report(work_order_id, completion):
+            # Store and send each report as it completes, so a slow batch loses nothing already done
+            now_dt = datetime.fromtimestamp(time.time())
+            current_time = now_dt.isoformat()
+            try:
+                work_orders_table.update_item(
+                    Key={'work_order_id': work_order_id},
+                    UpdateExpression="set safetyCheckResponse = :r, safetyCheckPerformedAt = :p",
+                    ExpressionAttributeValues={
+                        ':r': completion,
+                        ':p': current_time
+                    }
+                )
+            except Exception as table_error:
+                logger.error(f"Error updating WorkOrders table for {work_order_id}: {str(table_error)}")
+            send_to_client(api_gateway_management, connection_id, {
+                'type': 'batchReport',
+                'requestId': request_id,
+                'status': 'COMPLETED',
+                'workOrderId': work_order_id,
+                'safetyCheckResponse': completion,
+                'safetyCheckPerformedAt': current_time,
+                'agentFramework': requested_framework
+            }, timestamp=str(now_dt))
+
+        def run_location(location_name, group):
+            # One run per work order, serially so the site's lookups are cached after the first
+            location = locations.get(location_name, {})
+            completed = []
+            for work_order in group:
+                if context.get_remaining_time_in_millis() < BATCH_RUN_BUDGET_MS:
+                    break
+                payload = jdumps(work_order_details(work_order, location)).decode()
+                completion = invoke_agent(
+                    payload, str(uuid.uuid4()), api_gateway_management, connection_id, stream=False
+                )
+                deliver_report(work_order['work_order_id'], completion)
+                completed.append(work_order['work_order_id'])
+            return completed
+
+        with ThreadPoolExecutor(max_workers=BATCH_MAX_PARALLEL_RUNS) as pool:
+            completed_ids = set(itertools.chain.from_iterable(
+                pool.map(run_location, distinct_locations.keys(), distinct_locations.values())
+            ))
+
+        skipped_ids = [
+            work_order_id for work_order_id in work_order_ids
+            if work_order_id in work_orders and work_order_id not in completed_ids
+        ]
+        if skipped_ids:
+            logger.warning(f"Work orders skipped for lack of invocation time: {skipped_ids}")
+
+        send_to_client(api_gateway_management, connection_id, {
+            'type': 'batchFinal',
+            'requestId': request_id,
+            'status': 'COMPLETED',
+            'completedWorkOrderIds': [work_order_id for work_order_id in work_order_ids if work_order_id in completed_ids],
+            'skippedWorkOrderIds': skipped_ids,
+            'missingWorkOrderIds': missing_ids,
+            'agentFramework': requested_framework
+        })
+
+        return {'statusCode': 200, 'body': 'Batch sent'}
+
+    except Exception as e:
+        logger.error(f"handle_batch_message error: {str(e)}")
+        logger.error(traceback.format_exc())
+        send_to_client(api_gateway_management, connection_id, {
+            'type': 'error',
+            'requestId': request_id,
+            'status': 'COMPLETED',
+            'safetyCheckResponse': "Error in performing batch safety check::"+str(e),
+            'agentFramework': requested_framework
+        })
+        return {'statusCode': 500, 'body': f'Failed to process batch: {str(e)}'}
+
+# Outbound WebSocket messages are posted by a single background worker so the
+# agent streaming loops do not block on each post_to_connection round-trip
+_SEND_Q = queue.Queue()
+_SEND_WORKER = None
+_SEND_WORKER_LOCK = threading.Lock()
+
+def _send_worker():
+    while True:
+        api_gateway_management, connection_id, message, timestamp = _SEND_Q.get()
+        try:
+            post_to_client(api_gateway_management, connection_id, message, timestamp)
+        finally:
+            _SEND_Q.task_done()
+
+def send_to_client(api_gateway_management, connection_id, message, timestamp=None):
+    """Queue a message for the WebSocket client; delivery order is preserved"""
+    global _SEND_WORKER
+    if _SEND_WORKER is None:
+        with _SEND_WORKER_LOCK:
+            if _SEND_WORKER is None:
+                _SEND_WORKER = threading.Thread(target=_send_worker, daemon=True)
+                _SEND_WORKER.start()
+    _SEND_Q.put((api_gateway_management, connection_id, message, timestamp))
+
+def wait_for_sends():
+    """Block until every queued message has been posted, before the Lambda freezes"""
+    if _SEND_WORKER is not None:
+        _SEND_Q.join()
+
+def post_to_client(api_gateway_management, connection_id, message, timestamp=None):
     """Send message to WebSocket client"""
     try:
-        # Convert datetime to string before JSON serialization
-        current_time = str(datetime.now())
+        # Reuse the caller's timestamp when supplied; convert datetime to string before JSON serialization
+        current_time = timestamp or str(datetime.now())
         
         api_gateway_management.post_to_connection(
             ConnectionId=connection_id,
-            Data=json.dumps({
+            # orjson output is compact and handles datetimes in Bedrock traces natively;
+            # default=str covers any other non-serializable objects
+            Data=jdumps({
                 'message': message,
                 'sender': connection_id,
                 'timestamp': current_time  # Use string instead of datetime object
-            }, default=str)  # Add default=str to handle any other non-serializable objects
+            })
         )
         
        # logger.info(f"Message sent to {connection_id}: {message['type']}")
@@ -569,9 +793,7 @@ def send_to_client(api_gateway_management, connection_id, message):
 @logger.inject_lambda_context(log_event=True)
 def lambda_handler(event, context):
     try:
-        # Log the incoming event for debugging
-        logger.info(f"Received event: {json.dumps(event, default=str)}")
-        
+        # The incoming event is already logged by inject_lambda_context(log_event=True)
         # Safely get requestContext or raise a more descriptive error
         if 'requestContext' not in event:
             logger.error(f"Missing requestContext in event: {event}")
@@ -598,8 +820,8 @@ def lambda_handler(event, context):
                 return {'statusCode': 400, 'body': 'Missing request body'}
                 
             try:
-                message = json.loads(event['body'])
-            except json.JSONDecodeError as e:
+                message = jloads(event['body'])
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Invalid JSON in body: {str(e)}")
                 return {'statusCode': 400, 'body': 'Invalid JSON in request body'}
             
@@ -618,10 +840,7 @@ def lambda_handler(event, context):
             if request_context.get('domainName') and request_context.get('stage'):
                 domain_name = request_context['domainName']
                 stage = request_context['stage']
-                api_client = boto3.client(
-                    'apigatewaymanagementapi',
-                    endpoint_url=f'https://{domain_name}/{stage}'
-                )
+                api_client = get_apigw_client(domain_name, stage)
             else:
                 logger.error("Missing domainName or stage in requestContext")
                 return {'statusCode': 500, 'body': 'Missing API Gateway configuration'}
@@ -639,7 +858,13 @@ def lambda_handler(event, context):
                 decoded = verify_token(token)
                 user_email = decoded.get('email', 'unknown')
                 logger.info(f"Valid token for user: {user_email}")
-                return handle_message(api_client, connection_id, event)
+                try:
+                    # Reuse the body already parsed above instead of decoding it again
+                    if message.get('messageType') == 'batchSafetyReports':
+                        return handle_batch_message(api_client, connection_id, message, context)
+                    return handle_message(api_client, connection_id, message)
+                finally:
+                    wait_for_sends()
             except Exception as e:
                 logger.error(f"Token verification failed: {str(e)}")
                 logger.error(traceback.format_exc())
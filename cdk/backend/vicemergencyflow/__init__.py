@@ -62,8 +62,10 @@ class VicEmergencyStack(Construct):
 
         emergency_check_request_fn_plicy = iam.Policy(self, "EmergencyCheckReqiestFnPolicy")
 
+        stack = Stack.of(self)
+
         # Create ARN for the DynamoDB table
-        workorder_table_arn = f"arn:aws:dynamodb:{Stack.of(self).region}:{Stack.of(self).account}:table/{dynamo_db_workorder_table}"
+        workorder_table_arn = f"arn:aws:dynamodb:{stack.region}:{stack.account}:table/{dynamo_db_workorder_table}"
         
         emergency_check_request_fn_plicy.add_statements(
             iam.PolicyStatement(
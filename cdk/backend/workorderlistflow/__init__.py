@@ -27,6 +27,7 @@ class WorkOrderApiStack(Construct):
         api_gateway: core.CoreApiGateway,
         dynamo_db_workorder_table: str,
         dynamo_db_location_table: str,
+        base_path: str = "",
     ) -> None:
         super().__init__(scope, construct_id)
 
@@ -64,9 +65,11 @@ class WorkOrderApiStack(Construct):
 
         work_order_fn_policy = iam.Policy(self, "WorkOrdersFnPolicy")
 
+        stack = Stack.of(self)
+
         # Create ARNs for the DynamoDB tables and their indexes
-        workorder_table_arn = f"arn:aws:dynamodb:{Stack.of(self).region}:{Stack.of(self).account}:table/{dynamo_db_workorder_table}"
-        location_table_arn = f"arn:aws:dynamodb:{Stack.of(self).region}:{Stack.of(self).account}:table/{dynamo_db_location_table}"
+        workorder_table_arn = f"arn:aws:dynamodb:{stack.region}:{stack.account}:table/{dynamo_db_workorder_table}"
+        location_table_arn = f"arn:aws:dynamodb:{stack.region}:{stack.account}:table/{dynamo_db_location_table}"
         
         work_order_fn_policy.add_statements(
             iam.PolicyStatement(
@@ -112,7 +115,7 @@ class WorkOrderApiStack(Construct):
 
         # create optimization job API method
         api_gateway.add_method(
-            resource_path="/workorders/",
+            resource_path=f"{base_path}/workorders/",
             http_method="POST",
             lambda_function=work_order_fn,
             request_validator=api_gateway.request_body_validator,
@@ -4,17 +4,166 @@ from aws_cdk import (
     NestedStack,
     aws_iam as iam,
     aws_lambda as lambda_,
+    aws_lambda_python_alpha as lambda_python,
     aws_dynamodb as dynamodb,
     CfnOutput,
     Duration,
     RemovalPolicy,
     aws_bedrock as bedrock,
     aws_logs as logs,
+    custom_resources as cr,
 )
 from constructs import Construct
 from cdk_nag import NagSuppressions, NagPackSuppression
 
 
+# Static inference profile permissions shared by every Bedrock agent role
+_INFERENCE_PROFILE_INVOKE_ACTIONS = (
+    "bedrock:InvokeModel*",
+)
+_INFERENCE_PROFILE_INVOKE_RESOURCES = (
+    "arn:aws:bedrock:*::foundation-model/*",
+    "arn:aws:bedrock:*:*:inference-profile/*",
+    "arn:aws:bedrock:*:*:application-inference-profile/*",
+)
+# Agents only need to read inference profiles at runtime
+_INFERENCE_PROFILE_READ_ACTIONS = (
+    "bedrock:GetInferenceProfile",
+    "bedrock:ListInferenceProfiles",
+)
+_INFERENCE_PROFILE_READ_RESOURCES = (
+    "arn:aws:bedrock:*:*:inference-profile/*",
+    "arn:aws:bedrock:*:*:application-inference-profile/*",
+)
+
+
+# cdk-nag suppressions shared by every Bedrock agent role
+_BEDROCK_ROLE_SUPPRESSIONS = [
+    NagPackSuppression(
+        id="AwsSolutions-IAM4",
+        reason="Giving Bedrock permissions on Agent Role"
+    )
+]
+
+# Action group function schemas are static, so they are built once at import
+_WEATHER_SCHEMA = bedrock.CfnAgent.FunctionSchemaProperty(
+    functions=[
+        bedrock.CfnAgent.FunctionProperty(
+            name="weatherforecast",
+            description="Get weather forecast at lat and long for the datetime entered",
+            parameters={
+                "lat": bedrock.CfnAgent.ParameterDetailProperty(
+                    type="string",
+                    description="Latitude",
+                    required=True
+                ),
+                "long": bedrock.CfnAgent.ParameterDetailProperty(
+                    type="string",
+                    description="Longitude",
+                    required=True
+                ),
+                "target_datetime": bedrock.CfnAgent.ParameterDetailProperty(
+                    type="string",
+                    description="Target Date and Time",
+                    required=True
+                )
+            }
+        )
+    ]
+)
+
+_LOCATION_ALERT_SCHEMA = bedrock.CfnAgent.FunctionSchemaProperty(
+    functions=[
+        bedrock.CfnAgent.FunctionProperty(
+            name="fetch_location_alerts",
+            description="Get all incidents and hazards reported the location where the workorder has been created",
+            parameters={
+                "work_order_id": bedrock.CfnAgent.ParameterDetailProperty(
+                    type="string",
+                    description="Work Order ID",
+                    required=True
+                )
+            }
+        )
+    ]
+)
+
+_EMERGENCY_ALERT_SCHEMA = bedrock.CfnAgent.FunctionSchemaProperty(
+    functions=[
+        bedrock.CfnAgent.FunctionProperty(
+            name="emvalert",
+            description="Get emergency alert at lat and long",
+            parameters={
+                "lat": bedrock.CfnAgent.ParameterDetailProperty(
+                    type="string",
+                    description="Latitude",
+                    required=True
+                ),
+                "long": bedrock.CfnAgent.ParameterDetailProperty(
+                    type="string",
+                    description="Longitude",
+                    required=True
+                )
+            }
+        )
+    ]
+)
+
+_SUPERVISOR_INSTRUCTION = """
+<role_definition>
+Safety Report Supervisor | Input: WorkOrder Details JSON | Output: HTML Report
+</role_definition>
+<workflow>            
+1. When you receive input message, extract agent function call parameters work_order_id, latitude, longitude, and target_datetime.
+2. To perform safety briefing, Perform hazard, weather, and emergency checks using provided collaborator agents and valid parameters.
+   The three checks are independent: invoke LocationAlertAgent, WeatherAgent and EmergencyAlertAgent in parallel, do not wait for one response before invoking the next.
+   LocationAlertAgent - Call with only work_order_id
+   WeatherAgent - Call with latitude, longitude and target_datetime
+   EmergencyAlertAgent - Call with latitude, longitude 
+3. Organize the information from all collaborators into a structured HTML report.
+</workflow>
+<outputreportformat>
+You must format your final report using this exact HTML structure:
+<div>
+  <h1>Safety Report for Work Order [work_order_id]</h1>
+  <section>
+    <h2>Location Alerts</h2>
+    <p>[Insert workorder location specific hazard, incident information here]</p>
+  </section>
+  <section>
+    <h2>Weather Forecast</h2>
+  <p>[Insert weather information and warnings here]</p>
+  </section>
+  <section>
+    <h2>Emergency Alerts</h2>
+    <p>[Insert emergency alert infromation here]</p>
+  </section>  
+  <section>
+    <h2>Safety Recommendations</h2>
+    <p>[Insert Safety Recommendation, Location specific Control Measures here]</p>
+  </section>
+</div>
+</outputreportformat>
+
+<critical_notes>
+- STRICTLY FOLLOW <WORKFLOW> steps
+- NEVER SHOW INTERNAL PROCESSING STEPS, Location Coordinates in the output report
+- PRODUCE VALID HTML OUTPUT
+</critical_notes>"""
+
+
+# Tools Lambda settings used when the parent stack does not pass a stage profile
+DEFAULT_LAMBDA_PROFILE = {
+    # Latest Python runtime
+    "runtime": lambda_.Runtime.PYTHON_3_13,
+    "memory_size": 1024,
+    # Tools make one HTTP call or a few DynamoDB reads, so fail fast instead of
+    # holding the supervisor turn open
+    "timeout": Duration.seconds(8),
+    "architecture": lambda_.Architecture.ARM_64,
+}
+
+
 class BedrockAgentsStack(NestedStack):
     """Nested stack for Bedrock Agents functionality"""
     def __init__(
@@ -24,10 +173,16 @@ class BedrockAgentsStack(NestedStack):
         collaborator_foundation_model: str,
         supervisor_foundation_model: str,
         data_infrastructure_stack,  # Reference to shared data infrastructure
+        # Per-stage tools Lambda settings: runtime, memory_size (tune with AWS Lambda
+        # Power Tuning, see README), timeout and architecture
+        lambda_profile: dict = None,
+        agent_session_ttl: int = 1800,
         **kwargs
     ) -> None:
         
         super().__init__(scope, construct_id, **kwargs)
+
+        lambda_profile = {**DEFAULT_LAMBDA_PROFILE, **(lambda_profile or {})}
         
         # Add stack-level NAG suppressions for common patterns
         NagSuppressions.add_stack_suppressions(
@@ -53,23 +208,22 @@ class BedrockAgentsStack(NestedStack):
         locations_table = data_infrastructure_stack.locations_table
         hazards_table = data_infrastructure_stack.hazards_table
         incidents_table = data_infrastructure_stack.incidents_table
-        assets_table = data_infrastructure_stack.assets_table
         location_hazards_table = data_infrastructure_stack.location_hazards_table
         control_measures_table = data_infrastructure_stack.control_measures_table
 
-        # Create Lambda execution role
-        lambda_execution_role = iam.Role(
+        # Create Lambda execution role for the agent tools function
+        agent_tools_exec_role = iam.Role(
             self,
-            "LambdaExecutionRole",
+            "AgentToolsExecutionRole",
             assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"),
             managed_policies=[
                 iam.ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole")
             ]
         )
-        
+
         # Add NAG suppression for Lambda execution role managed policy
         NagSuppressions.add_resource_suppressions(
-            lambda_execution_role,
+            agent_tools_exec_role,
             [
                 NagPackSuppression(
                     id="AwsSolutions-IAM4",
@@ -79,93 +233,70 @@ class BedrockAgentsStack(NestedStack):
             apply_to_children=True
         )
 
-        # Add DynamoDB permissions for Lambda functions to access shared tables
-        lambda_execution_role.add_to_policy(
+        # Only the location alert tool reads DynamoDB, and only via GetItem, BatchGetItem and Query
+        location_alert_tables = [
+            work_orders_table,
+            locations_table,
+            hazards_table,
+            incidents_table,
+            location_hazards_table,
+            control_measures_table,
+        ]
+        agent_tools_exec_role.add_to_policy(
             iam.PolicyStatement(
-                sid="DynamoDBAccess",
+                sid="DynamoDBReadAccess",
                 effect=iam.Effect.ALLOW,
                 actions=[
                     "dynamodb:GetItem",
-                    "dynamodb:Query",
-                    "dynamodb:Scan",
-                    "dynamodb:BatchWriteItem",
-                    "dynamodb:PutItem"
+                    "dynamodb:BatchGetItem",
+                    "dynamodb:Query"
                 ],
-                resources=[
-                    work_orders_table.table_arn,
-                    locations_table.table_arn,
-                    hazards_table.table_arn,
-                    incidents_table.table_arn,
-                    assets_table.table_arn,
-                    location_hazards_table.table_arn,
-                    control_measures_table.table_arn,
-                    f"{work_orders_table.table_arn}/index/*",
-                    f"{locations_table.table_arn}/index/*",
-                    f"{hazards_table.table_arn}/index/*",
-                    f"{incidents_table.table_arn}/index/*",
-                    f"{assets_table.table_arn}/index/*",
-                    f"{location_hazards_table.table_arn}/index/*",
-                    f"{control_measures_table.table_arn}/index/*"
-                ]
+                resources=[table.table_arn for table in location_alert_tables]
+                + [f"{table.table_arn}/index/*" for table in location_alert_tables]
             )
         )
 
-        # Create explicit log group for weather agent function
-        weather_agent_log_group = logs.LogGroup(
+        # Third-party dependencies the tools function needs beyond the runtime, bundled
+        # once into a layer so the function asset only carries its handler code. boto3
+        # and urllib3 come with the Lambda runtime and are not repackaged here
+        agent_commons_layer = lambda_python.PythonLayerVersion(
             self,
-            "WeatherAgentLogGroup",
-            log_group_name=f"/aws/lambda/{construct_id.lower()}-weather-agent",
-            retention=logs.RetentionDays.ONE_WEEK,
-            removal_policy=RemovalPolicy.DESTROY
-        )
-        
-        # Create Weather Agent Lambda Function
-        weather_agent_function = lambda_.Function(
-            self,
-            "WeatherAgentFunction",
-            function_name=f"{construct_id.lower()}-weather-agent",
-            runtime=lambda_.Runtime.PYTHON_3_13,  # Updated to latest Python runtime
-            handler="index.lambda_handler",
-            code=lambda_.Code.from_asset("./bedrock_agents/weather_agent"),
-            role=lambda_execution_role,
-            timeout=Duration.seconds(30),
-            memory_size=256,
-            environment={
-                "LOG_LEVEL": "INFO"
-            }
-        )
-        
-        # Add NAG suppression for Lambda runtime
-        NagSuppressions.add_resource_suppressions(
-            weather_agent_function,
-            [
-                NagPackSuppression(
-                    id="AwsSolutions-L1",
-                    reason="Using the latest Python runtime version 3.13"
-                )
-            ]
+            "AgentCommonsLayer",
+            entry=f"{os.path.dirname(os.path.realpath(__file__))}/_layer",
+            compatible_runtimes=[lambda_profile["runtime"]],
+            compatible_architectures=[lambda_profile["architecture"]],
+            description="Common dependencies for the Bedrock agent tool functions",
         )
-        
-        # Create explicit log group for location alert function
-        location_alert_log_group = logs.LogGroup(
+
+        # Warm containers kept for the interactive path, set with `--context pc_count=N`
+        # (0 by default so dev stacks do not pay for idle capacity)
+        provisioned_concurrency = int(self.node.try_get_context("pc_count") or 0)
+
+        # Create explicit log group for the agent tools function
+        agent_tools_log_group = logs.LogGroup(
             self,
-            "LocationAlertLogGroup",
-            log_group_name=f"/aws/lambda/{construct_id.lower()}-location-alert",
+            "AgentToolsLogGroup",
+            log_group_name=f"/aws/lambda/{construct_id.lower()}-agent-tools",
             retention=logs.RetentionDays.ONE_WEEK,
             removal_policy=RemovalPolicy.DESTROY
         )
         
-        # Create Location Alert Lambda Function
-        location_alert_function = lambda_.Function(
+        # Create one Lambda Function serving the weather, location alert and emergency alert
+        # tools; it routes on the action group so a single warm container handles a whole turn
+        agent_tools_function = lambda_.Function(
             self,
-            "LocationAlertFunction",
-            function_name=f"{construct_id.lower()}-location-alert",
-            runtime=lambda_.Runtime.PYTHON_3_13,  # Updated to latest Python runtime
+            "AgentToolsFunction",
+            function_name=f"{construct_id.lower()}-agent-tools",
             handler="index.lambda_handler",
-            code=lambda_.Code.from_asset("./bedrock_agents/location_alert"),
-            role=lambda_execution_role,
-            timeout=Duration.seconds(30),
-            memory_size=256,
+            code=lambda_.Code.from_asset("./bedrock_agents/agent_tools", exclude=["__pycache__", "*.pyc"]),
+            role=agent_tools_exec_role,
+            **lambda_profile,
+            layers=[agent_commons_layer],
+            # Restore from a post-init snapshot instead of re-importing boto3 on cold start;
+            # Lambda does not allow SnapStart alongside provisioned concurrency
+            snap_start=None if provisioned_concurrency else lambda_.SnapStartConf.ON_PUBLISHED_VERSIONS,
+            # Lambda Insights reports per-invocation CPU and memory use for right-sizing
+            insights_version=lambda_.LambdaInsightsVersion.VERSION_1_0_229_0,
             environment={
                 "WORK_ORDERS_TABLE_NAME": work_orders_table.table_name,
                 "LOCATIONS_TABLE_NAME": locations_table.table_name,
@@ -173,13 +304,14 @@ class BedrockAgentsStack(NestedStack):
                 "INCIDENTS_TABLE_NAME": incidents_table.table_name,
                 "LOCATION_HAZARDS_TABLE_NAME": location_hazards_table.table_name,
                 "CONTROL_MEASURES_TABLE_NAME": control_measures_table.table_name,
-                "LOG_LEVEL": "INFO"
+                "LOG_LEVEL": "INFO",
+                "PYTHONUNBUFFERED": "1"
             }
         )
         
         # Add NAG suppression for Lambda runtime
         NagSuppressions.add_resource_suppressions(
-            location_alert_function,
+            agent_tools_function,
             [
                 NagPackSuppression(
                     id="AwsSolutions-L1",
@@ -188,242 +320,83 @@ class BedrockAgentsStack(NestedStack):
             ]
         )
         
-        # Create explicit log group for emergency alert function
-        emergency_alert_log_group = logs.LogGroup(
-            self,
-            "EmergencyAlertLogGroup",
-            log_group_name=f"/aws/lambda/{construct_id.lower()}-emergency-alert",
-            retention=logs.RetentionDays.ONE_WEEK,
-            removal_policy=RemovalPolicy.DESTROY
-        )
-        
-        # Create Emergency Alert Lambda Function
-        emergency_alert_function = lambda_.Function(
-            self,
-            "EmergencyAlertFunction",
-            function_name=f"{construct_id.lower()}-emergency-alert",
-            runtime=lambda_.Runtime.PYTHON_3_13,  # Updated to latest Python runtime
-            handler="index.lambda_handler",
-            code=lambda_.Code.from_asset("./bedrock_agents/emergency_alert"),
-            role=lambda_execution_role,
-            timeout=Duration.seconds(30),
-            memory_size=256,
-            environment={
-                "LOG_LEVEL": "INFO"
-            }
-        )
-        
-        # Add NAG suppression for Lambda runtime
-        NagSuppressions.add_resource_suppressions(
-            emergency_alert_function,
-            [
-                NagPackSuppression(
-                    id="AwsSolutions-L1",
-                    reason="Using the latest Python runtime version 3.13"
-                )
-            ]
-        )
-        
-        # Create Weather Agent IAM Role
-        weather_agent_role = iam.Role(
-            self,
-            "WeatherBedrockAgentExecutionRole",
-            assumed_by=iam.ServicePrincipal("bedrock.amazonaws.com"),
-            description='Execution role for Weather Bedrock Agent'
-        )
-        
-        # Add permissions for Weather agent to invoke Lambda function and use inference profiles
-        weather_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                sid="AmazonBedrockAgentInferencProfilePolicy1",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "bedrock:InvokeModel*",
-                    "bedrock:CreateInferenceProfile"
-                ],
-                resources=[
-                    "arn:aws:bedrock:*::foundation-model/*",
-                    "arn:aws:bedrock:*:*:inference-profile/*",
-                    "arn:aws:bedrock:*:*:application-inference-profile/*"
-                ]
+        # Enrolling in AWS Compute Optimizer lets it recommend memory sizes once the function
+        # has enough invocation history. Enrollment is account-wide and is not undone when the
+        # stack is deleted, so it only happens with --context enroll_compute_optimizer=true
+        if str(self.node.try_get_context("enroll_compute_optimizer")).lower() in ("true", "1"):
+            compute_optimizer_enrollment = cr.AwsCustomResource(
+                self,
+                "ComputeOptimizerEnrollment",
+                on_create=cr.AwsSdkCall(
+                    service="ComputeOptimizer",
+                    action="updateEnrollmentStatus",
+                    parameters={
+                        "status": "Active",
+                        "includeMemberAccounts": False
+                    },
+                    physical_resource_id=cr.PhysicalResourceId.of("ComputeOptimizerEnrollment")
+                ),
+                policy=cr.AwsCustomResourcePolicy.from_statements([
+                    iam.PolicyStatement(
+                        effect=iam.Effect.ALLOW,
+                        actions=["compute-optimizer:UpdateEnrollmentStatus"],
+                        resources=["*"]
+                    ),
+                    iam.PolicyStatement(
+                        effect=iam.Effect.ALLOW,
+                        actions=["iam:CreateServiceLinkedRole"],
+                        resources=["*"],
+                        conditions={
+                            "StringEquals": {"iam:AWSServiceName": "compute-optimizer.amazonaws.com"}
+                        }
+                    )
+                ]),
+                install_latest_aws_sdk=False
             )
-        )
 
-        weather_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                sid="AmazonBedrockAgentInferencProfilePolicy2",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "bedrock:GetInferenceProfile",
-                    "bedrock:ListInferenceProfiles",
-                    "bedrock:DeleteInferenceProfile",
-                    "bedrock:TagResource",
-                    "bedrock:UntagResource",
-                    "bedrock:ListTagsForResource",
+            # Add NAG suppression for the custom resource's CDK-managed Lambda function
+            NagSuppressions.add_resource_suppressions(
+                compute_optimizer_enrollment,
+                [
+                    NagPackSuppression(
+                        id="AwsSolutions-IAM5",
+                        reason="Compute Optimizer enrollment is an account-level call without a resource ARN"
+                    )
                 ],
-                resources=[
-                    "arn:aws:bedrock:*:*:inference-profile/*",
-                    "arn:aws:bedrock:*:*:application-inference-profile/*"
-                ]
+                apply_to_children=True
             )
-        )
-
 
-        weather_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                effect=iam.Effect.ALLOW,
-                actions=["lambda:InvokeFunction"],
-                resources=[weather_agent_function.function_arn]
-            )
-        )
-        
-        # Create Location Alert Agent IAM Role
-        location_alert_agent_role = iam.Role(
+        # SnapStart and provisioned concurrency only apply to published versions,
+        # so the agents invoke the function through a "live" alias
+        agent_tools_alias = lambda_.Alias(
             self,
-            "LocationAlertBedrockAgentExecutionRole",
-            assumed_by=iam.ServicePrincipal("bedrock.amazonaws.com"),
-            description='Execution role for Location Alert Bedrock Agent'
-        )
-        
-        # Add permissions for Location Alert agent to invoke Lambda function and use inference profiles
-        location_alert_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                sid="AmazonBedrockAgentInferencProfilePolicy1",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "bedrock:InvokeModel*",
-                    "bedrock:CreateInferenceProfile"
-                ],
-                resources=[
-                    "arn:aws:bedrock:*::foundation-model/*",
-                    "arn:aws:bedrock:*:*:inference-profile/*",
-                    "arn:aws:bedrock:*:*:application-inference-profile/*"
-                ]
-            )
+            "AgentToolsLiveAlias",
+            alias_name="live",
+            version=agent_tools_function.current_version,
+            provisioned_concurrent_executions=provisioned_concurrency or None
         )
 
-        location_alert_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                sid="AmazonBedrockAgentInferencProfilePolicy2",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "bedrock:GetInferenceProfile",
-                    "bedrock:ListInferenceProfiles",
-                    "bedrock:DeleteInferenceProfile",
-                    "bedrock:TagResource",
-                    "bedrock:UntagResource",
-                    "bedrock:ListTagsForResource"
-                ],
-                resources=[
-                    "arn:aws:bedrock:*:*:inference-profile/*",
-                    "arn:aws:bedrock:*:*:application-inference-profile/*"
-                ]
-            )
+        # Create an IAM role per collaborator agent, each may only invoke the tools function
+        weather_agent_role = self._make_bedrock_agent_role(
+            "WeatherBedrockAgentExecutionRole",
+            "Execution role for Weather Bedrock Agent",
+            lambda_arn=agent_tools_alias.function_arn
         )
-
-        location_alert_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                effect=iam.Effect.ALLOW,
-                actions=["lambda:InvokeFunction"],
-                resources=[location_alert_function.function_arn]
-            )
+        location_alert_agent_role = self._make_bedrock_agent_role(
+            "LocationAlertBedrockAgentExecutionRole",
+            "Execution role for Location Alert Bedrock Agent",
+            lambda_arn=agent_tools_alias.function_arn
         )
-        
-        # Create Emergency Alert Agent IAM Role
-        emergency_alert_agent_role = iam.Role(
-            self,
+        emergency_alert_agent_role = self._make_bedrock_agent_role(
             "EmergencyAlertBedrockAgentExecutionRole",
-            assumed_by=iam.ServicePrincipal("bedrock.amazonaws.com"),
-            description='Execution role for Emergency Alert Bedrock Agent'
-        )
-        
-        # Add permissions for Emergency Alert agent to invoke Lambda function and use inference profiles
-        emergency_alert_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                sid="AmazonBedrockAgentInferencProfilePolicy1",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "bedrock:InvokeModel*",
-                    "bedrock:CreateInferenceProfile"
-                ],
-                resources=[
-                    "arn:aws:bedrock:*::foundation-model/*",
-                    "arn:aws:bedrock:*:*:inference-profile/*",
-                    "arn:aws:bedrock:*:*:application-inference-profile/*"
-                ]
-            )
-        )
-        
-        emergency_alert_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                sid="AmazonBedrockAgentInferencProfilePolicy2",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "bedrock:GetInferenceProfile",
-                    "bedrock:ListInferenceProfiles",
-                    "bedrock:DeleteInferenceProfile",
-                    "bedrock:TagResource",
-                    "bedrock:UntagResource",
-                    "bedrock:ListTagsForResource"
-                ],
-                resources=[
-                    "arn:aws:bedrock:*:*:inference-profile/*",
-                    "arn:aws:bedrock:*:*:application-inference-profile/*"
-                ]
-            )
+            "Execution role for Emergency Alert Bedrock Agent",
+            lambda_arn=agent_tools_alias.function_arn
         )
 
-        emergency_alert_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                effect=iam.Effect.ALLOW,
-                actions=["lambda:InvokeFunction"],
-                resources=[emergency_alert_function.function_arn]
-            )
-        )
-        
-        # Create Supervisor Agent IAM Role
         # Create Supervisor Agent IAM Role
-        supervisor_agent_role = iam.Role(
-            self,
+        supervisor_agent_role = self._make_bedrock_agent_role(
             "SupervisorAgentRole",
-            assumed_by=iam.ServicePrincipal("bedrock.amazonaws.com"),
-            description='Execution role for Supervisor Bedrock Agent'
-        )
-        
-        # Add permissions for Supervisor agent to use inference profiles
-        supervisor_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                sid="AmazonBedrockAgentInferencProfilePolicy1",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "bedrock:InvokeModel*",
-                    "bedrock:CreateInferenceProfile"
-                ],
-                resources=[
-                    "arn:aws:bedrock:*::foundation-model/*",
-                    "arn:aws:bedrock:*:*:inference-profile/*",
-                    "arn:aws:bedrock:*:*:application-inference-profile/*"
-                ]
-            )
-        )
-        
-        supervisor_agent_role.add_to_policy(
-            iam.PolicyStatement(
-                sid="AmazonBedrockAgentInferencProfilePolicy2",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "bedrock:GetInferenceProfile",
-                    "bedrock:ListInferenceProfiles",
-                    "bedrock:DeleteInferenceProfile",
-                    "bedrock:TagResource",
-                    "bedrock:UntagResource",
-                    "bedrock:ListTagsForResource"
-                ],
-                resources=[
-                    "arn:aws:bedrock:*:*:inference-profile/*",
-                    "arn:aws:bedrock:*:*:application-inference-profile/*"
-                ]
-            )
+            "Execution role for Supervisor Bedrock Agent"
         )
         
         # Add permissions for agent collaboration
@@ -469,159 +442,53 @@ class BedrockAgentsStack(NestedStack):
             )
         )
         
-        # Add CloudWatch Logs permissions for all agent roles
-        for role in [weather_agent_role, location_alert_agent_role, emergency_alert_agent_role, supervisor_agent_role]:
-            role.add_to_policy(
-                iam.PolicyStatement(
-                    sid="CloudWatchLogsAccess",
-                    effect=iam.Effect.ALLOW,
-                    actions=[
-                        'logs:CreateLogStream',
-                        'logs:PutLogEvents'
-                    ],
-                    resources=[
-                        f"arn:aws:logs:{self.region}:{self.account}:log-group:/aws/bedrock/*:*"
-                    ]
-                )
+        # Pre-create a log group per agent and let each role write only to its own
+        for log_group_id, agent_name, role in [
+            ("WeatherAgentTraceLogGroup", "FieldSafetyWeatherAgent", weather_agent_role),
+            ("LocationAlertAgentTraceLogGroup", "FieldSafetyLocationAlertAgent", location_alert_agent_role),
+            ("EmergencyAlertAgentTraceLogGroup", "FieldSafetyEmergencyAlertAgent", emergency_alert_agent_role),
+            ("SupervisorAgentTraceLogGroup", "FieldSafetySupervisorAgent", supervisor_agent_role),
+        ]:
+            agent_log_group = logs.LogGroup(
+                self,
+                log_group_id,
+                log_group_name=f"/aws/bedrock/agents/{agent_name}",
+                retention=logs.RetentionDays.ONE_WEEK,
+                removal_policy=RemovalPolicy.DESTROY
             )
-        
- 
-    
-        # Add NAG suppression for Bedrock agent role
-        NagSuppressions.add_resource_suppressions(
-            weather_agent_role,
-            [
-                NagPackSuppression(
-                    id="AwsSolutions-IAM4",
-                    reason="Giving Bedrock permissions on Agent Role"
-                )
-            ],
-            apply_to_children=True
-        )
-        # Add NAG suppression for Bedrock agent role
-        NagSuppressions.add_resource_suppressions(
-            location_alert_agent_role,
-            [
-                NagPackSuppression(
-                    id="AwsSolutions-IAM4",
-                    reason="Giving Bedrock permissions on Agent Role"
-                )
-            ],
-            apply_to_children=True
-        )
-
-        # Add NAG suppression for Bedrock agent role
-        NagSuppressions.add_resource_suppressions(
-            emergency_alert_agent_role,
-            [
-                NagPackSuppression(
-                    id="AwsSolutions-IAM4",
-                    reason="Giving Bedrock permissions on Agent Role"
-                )
-            ],
-            apply_to_children=True
-        )
-
-        # Add NAG suppression for Bedrock agent role
-        NagSuppressions.add_resource_suppressions(
-            supervisor_agent_role,
-            [
-                NagPackSuppression(
-                    id="AwsSolutions-IAM4",
-                    reason="Giving Bedrock permissions on Agent Role"
-                )
-            ],
-            apply_to_children=True
-        )
+            agent_log_group.grant_write(role)
 
         # Create Weather Agent Action Group
         weather_agent_action_group = bedrock.CfnAgent.AgentActionGroupProperty(
             action_group_name="WeatherForecast",
             action_group_executor=bedrock.CfnAgent.ActionGroupExecutorProperty(
-                lambda_=weather_agent_function.function_arn
+                lambda_=agent_tools_alias.function_arn
             ),
             description="Get weather forecast and warnings for a specific location and time",
             action_group_state="ENABLED",
-            function_schema=bedrock.CfnAgent.FunctionSchemaProperty(
-                functions=[
-                    bedrock.CfnAgent.FunctionProperty(
-                        name="weatherforecast",
-                        description="Get weather forecast at lat and long for the datetime entered",
-                        parameters={
-                            "lat": bedrock.CfnAgent.ParameterDetailProperty(
-                                type="string",
-                                description="Latitude",
-                                required=True
-                            ),
-                            "long": bedrock.CfnAgent.ParameterDetailProperty(
-                                type="string",
-                                description="Longitude",
-                                required=True
-                            ),
-                            "target_datetime": bedrock.CfnAgent.ParameterDetailProperty(
-                                type="string",
-                                description="Target Date and Time",
-                                required=True
-                            )
-                        }
-                    )
-                ]
-            )
+            function_schema=_WEATHER_SCHEMA
         )
         
         # Create Location Alert Action Group
         location_alert_action_group = bedrock.CfnAgent.AgentActionGroupProperty(
             action_group_name="LocationAlerts",
             action_group_executor=bedrock.CfnAgent.ActionGroupExecutorProperty(
-                lambda_=location_alert_function.function_arn
+                lambda_=agent_tools_alias.function_arn
             ),
             description="Get safety alerts for a specific work order location",
             action_group_state="ENABLED",
-            function_schema=bedrock.CfnAgent.FunctionSchemaProperty(
-                functions=[
-                    bedrock.CfnAgent.FunctionProperty(
-                        name="fetch_location_alerts",
-                        description="Get all incidents and hazards reported the location where the workorder has been created",
-                        parameters={
-                            "work_order_id": bedrock.CfnAgent.ParameterDetailProperty(
-                                type="string",
-                                description="Work Order ID",
-                                required=True
-                            )
-                        }
-                    )
-                ]
-            )
+            function_schema=_LOCATION_ALERT_SCHEMA
         )
         
         # Create Emergency Alert Action Group
         emergency_alert_action_group = bedrock.CfnAgent.AgentActionGroupProperty(
             action_group_name="EmergencyAlerts",
             action_group_executor=bedrock.CfnAgent.ActionGroupExecutorProperty(
-                lambda_=emergency_alert_function.function_arn
+                lambda_=agent_tools_alias.function_arn
             ),
             description="Get emergency alerts for a specific location",
             action_group_state="ENABLED",
-            function_schema=bedrock.CfnAgent.FunctionSchemaProperty(
-                functions=[
-                    bedrock.CfnAgent.FunctionProperty(
-                        name="emvalert",
-                        description="Get emergency alert at lat and long",
-                        parameters={
-                            "lat": bedrock.CfnAgent.ParameterDetailProperty(
-                                type="string",
-                                description="Latitude",
-                                required=True
-                            ),
-                            "long": bedrock.CfnAgent.ParameterDetailProperty(
-                                type="string",
-                                description="Longitude",
-                                required=True
-                            )
-                        }
-                    )
-                ]
-            )
+            function_schema=_EMERGENCY_ALERT_SCHEMA
         )
         
         # Create Weather Agent with autoPrepare=True
@@ -634,7 +501,7 @@ class BedrockAgentsStack(NestedStack):
             description = "You are a weather forecast agent. On getting access to the latitude, longitude and target_date_time, you will be able to provide weather warnings and alerts",
             instruction="Goal: Fetch the weather information at a latitude and longitude at a target datetime.,Instructions: Fetch the weather information and alerts at a latitude and longitude at a target datetime. You may get the Workorder details in JSON format including workorder location",
             action_groups=[weather_agent_action_group],
-            idle_session_ttl_in_seconds=1800,
+            idle_session_ttl_in_seconds=agent_session_ttl,
             auto_prepare=True  # Use autoPrepare instead of custom resource
         )
         
@@ -650,7 +517,7 @@ class BedrockAgentsStack(NestedStack):
             description = "You are a safety officer whose job is to find all reported incidents at the location, all hazards reported the location and then prepare a safety briefing for the field workforce technician",
             instruction="Role: Safety officer, Goal: When a workorder is assigned to a field workforce technician, provide all possible incidents and hazards reported at the location for the workorder to ensure that the technician is well informed",
             action_groups=[location_alert_action_group],
-            idle_session_ttl_in_seconds=1800,
+            idle_session_ttl_in_seconds=agent_session_ttl,
             auto_prepare=True  # Use autoPrepare instead of custom resource
         )
         
@@ -666,7 +533,7 @@ class BedrockAgentsStack(NestedStack):
             description = "Agent that fetches the Emergency warnings and alerts for a given location",
             instruction="You are an emergency assistant that provides emergency alerts for specific locations. Fetch the emergency warnings at a latitude and longitude.You will get the latitude and longitude details from Workorder location.",
             action_groups=[emergency_alert_action_group],
-            idle_session_ttl_in_seconds=1800,
+            idle_session_ttl_in_seconds=agent_session_ttl,
             auto_prepare=True  # Use autoPrepare instead of custom resource
         )
 
@@ -707,47 +574,8 @@ class BedrockAgentsStack(NestedStack):
             agent_resource_role_arn=supervisor_agent_role.role_arn,
             foundation_model=supervisor_foundation_model,
             description = "A specialized safety report generator that performs work order safety assessment and generates a comprehensive Work Order Safety Briefiing in HTML format.",
-            instruction="""
-<role_definition>
-Safety Report Supervisor | Input: WorkOrder Details JSON | Output: HTML Report
-</role_definition>
-<workflow>            
-1. When you receive input message, extract agent function call parameters work_order_id, latitude, longitude, and target_datetime.
-2. To perform safety briefing, Perform hazard, weather, and emergency checks using provided collaborator agents and valid parameters.
-   LocationAlertAgent - Call with only work_order_id
-   WeatherAgent - Call with latitude, longitude and target_datetime
-   EmergencyAlertAgent - Call with latitude, longitude 
-3. Organize the information from all collaborators into a structured HTML report.
-</workflow>
-<outputreportformat>
-You must format your final report using this exact HTML structure:
-<div>
-  <h1>Safety Report for Work Order [work_order_id]</h1>
-  <section>
-    <h2>Location Alerts</h2>
-    <p>[Insert workorder location specific hazard, incident information here]</p>
-  </section>
-  <section>
-    <h2>Weather Forecast</h2>
-  <p>[Insert weather information and warnings here]</p>
-  </section>
-  <section>
-    <h2>Emergency Alerts</h2>
-    <p>[Insert emergency alert infromation here]</p>
-  </section>  
-  <section>
-    <h2>Safety Recommendations</h2>
-    <p>[Insert Safety Recommendation, Location specific Control Measures here]</p>
-  </section>
-</div>
-</outputreportformat>
-
-<critical_notes>
-- STRICTLY FOLLOW <WORKFLOW> steps
-- NEVER SHOW INTERNAL PROCESSING STEPS, Location Coordinates in the output report
-- PRODUCE VALID HTML OUTPUT
-</critical_notes>""",
-            idle_session_ttl_in_seconds=1800,
+            instruction=_SUPERVISOR_INSTRUCTION,
+            idle_session_ttl_in_seconds=agent_session_ttl,
             auto_prepare=True,  # Use autoPrepare instead of custom resource
             # Add agent collaboration configuration
             agent_collaboration="SUPERVISOR",
@@ -756,7 +584,7 @@ You must format your final report using this exact HTML structure:
                     agent_descriptor=bedrock.CfnAgent.AgentDescriptorProperty(
                         alias_arn=weather_agent_alias.attr_agent_alias_arn
                     ),
-                    collaboration_instruction="Use this agent to get weather forecast for work order location and time.",
+                    collaboration_instruction="Use this agent to get weather forecast for work order location and time. It is independent of the other collaborators and can be called in parallel with them.",
                     collaborator_name="WeatherAgent",
                     relay_conversation_history="DISABLED"
                 ),
@@ -764,7 +592,7 @@ You must format your final report using this exact HTML structure:
                     agent_descriptor=bedrock.CfnAgent.AgentDescriptorProperty(
                         alias_arn=location_alert_agent_alias.attr_agent_alias_arn
                     ),
-                    collaboration_instruction="Use this agent to get hazards and incidents for work order location.",
+                    collaboration_instruction="Use this agent to get hazards and incidents for work order location. It is independent of the other collaborators and can be called in parallel with them.",
                     collaborator_name="LocationAlertAgent",
                     relay_conversation_history="DISABLED"
                 ),
@@ -772,7 +600,7 @@ You must format your final report using this exact HTML structure:
                     agent_descriptor=bedrock.CfnAgent.AgentDescriptorProperty(
                         alias_arn=emergency_alert_agent_alias.attr_agent_alias_arn
                     ),
-                    collaboration_instruction="Use this agent to get emergency alerts for work order location.",
+                    collaboration_instruction="Use this agent to get emergency alerts for work order location. It is independent of the other collaborators and can be called in parallel with them.",
                     collaborator_name="EmergencyAlertAgent",
                     relay_conversation_history="DISABLED"
                 )
@@ -806,7 +634,7 @@ You must format your final report using this exact HTML structure:
             self,
             "WeatherLambdaPermission",
             action="lambda:InvokeFunction",
-            function_name=weather_agent_function.function_name,
+            function_name=agent_tools_alias.function_arn,
             principal="bedrock.amazonaws.com",
             source_arn=f"arn:aws:bedrock:{self.region}:{self.account}:agent/{weather_agent.attr_agent_id}"
         )
@@ -815,7 +643,7 @@ You must format your final report using this exact HTML structure:
             self,
             "LocationAlertLambdaPermission",
             action="lambda:InvokeFunction",
-            function_name=location_alert_function.function_name,
+            function_name=agent_tools_alias.function_arn,
             principal="bedrock.amazonaws.com",
             source_arn=f"arn:aws:bedrock:{self.region}:{self.account}:agent/{location_alert_agent.attr_agent_id}"
         )
@@ -824,7 +652,7 @@ You must format your final report using this exact HTML structure:
             self,
             "EmergencyAlertLambdaPermission",
             action="lambda:InvokeFunction",
-            function_name=emergency_alert_function.function_name,
+            function_name=agent_tools_alias.function_arn,
             principal="bedrock.amazonaws.com",
             source_arn=f"arn:aws:bedrock:{self.region}:{self.account}:agent/{emergency_alert_agent.attr_agent_id}"
         )
@@ -877,3 +705,48 @@ You must format your final report using this exact HTML structure:
             value=supervisor_agent_alias.attr_agent_alias_id,
             export_name=f"{construct_id}-SupervisorAgentAliasId"
         )
+
+    def _make_bedrock_agent_role(self, id_: str, description: str, lambda_arn: str = None) -> iam.Role:
+        """Create a Bedrock agent execution role with the shared inference profile permissions"""
+        role = iam.Role(
+            self,
+            id_,
+            assumed_by=iam.ServicePrincipal("bedrock.amazonaws.com"),
+            description=description
+        )
+
+        # Add permissions for the agent to use inference profiles
+        role.add_to_policy(
+            iam.PolicyStatement(
+                sid="AmazonBedrockAgentInferencProfilePolicy1",
+                effect=iam.Effect.ALLOW,
+                actions=list(_INFERENCE_PROFILE_INVOKE_ACTIONS),
+                resources=list(_INFERENCE_PROFILE_INVOKE_RESOURCES)
+            )
+        )
+        role.add_to_policy(
+            iam.PolicyStatement(
+                sid="AmazonBedrockAgentInferencProfilePolicy2",
+                effect=iam.Effect.ALLOW,
+                actions=list(_INFERENCE_PROFILE_READ_ACTIONS),
+                resources=list(_INFERENCE_PROFILE_READ_RESOURCES)
+            )
+        )
+
+        # Collaborator agents may only invoke their own action group Lambda
+        if lambda_arn:
+            role.add_to_policy(
+                iam.PolicyStatement(
+                    effect=iam.Effect.ALLOW,
+                    actions=["lambda:InvokeFunction"],
+                    resources=[lambda_arn]
+                )
+            )
+
+        # Add NAG suppression for Bedrock agent role
+        NagSuppressions.add_resource_suppressions(
+            role,
+            _BEDROCK_ROLE_SUPPRESSIONS,
+            apply_to_children=True
+        )
+        return role
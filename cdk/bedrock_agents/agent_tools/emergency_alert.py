@@ -5,13 +5,24 @@ import logging
 import os
 from datetime import datetime, timedelta
 
+from ttl_cache import TTLCache
+
 log_level = os.environ.get("LOG_LEVEL", "INFO").strip().upper()
-logging.basicConfig(
-    format="[%(asctime)s] p%(process)s {%(filename)s:%(lineno)d} %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 logger.setLevel(log_level)
 
+# Keep outbound calls well inside the Lambda timeout so a hung API fails fast
+HTTP_TIMEOUT = urllib3.Timeout(connect=1, read=3)
+# One retry still fits inside the 8 s function timeout
+HTTP_RETRIES = urllib3.Retry(total=1, backoff_factor=0.2)
+
+# Shared across warm invocations so the HTTPS connection is reused
+_HTTP = urllib3.PoolManager(num_pools=4, maxsize=8)
+
+# Emergency events change quickly, so the feed is only reused for a short window
+EMERGENCY_FEED_TTL_SECONDS = 120
+_CACHE = TTLCache(maxsize=1)
+
 FUNCTION_NAMES = []
 
 try:
@@ -24,10 +35,15 @@ except Exception as e:
 def emvalert(lat, long):
     search_point = (long, lat)
 
-    # Download the GeoJSON data
-    http = urllib3.PoolManager()
-    response = http.request('GET', 'https://emergency.vic.gov.au/public/events-geojson.json')
-    geojson_data = json.loads(response.data.decode('utf-8'))
+    # Download the GeoJSON data, reusing a recent copy of the state-wide feed
+    def fetch():
+        response = _HTTP.request('GET', 'https://emergency.vic.gov.au/public/events-geojson.json', timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES)
+        # Raising keeps a failed download out of the cache
+        if response.status != 200:
+            raise ValueError(f"Emergency feed returned HTTP {response.status}")
+        return json.loads(response.data.decode('utf-8'))
+
+    geojson_data = _CACHE.get_or_fetch("events-geojson", EMERGENCY_FEED_TTL_SECONDS, fetch)
     
     relevant_incidents = []
     
@@ -45,7 +61,7 @@ def emvalert(lat, long):
     
     return {
         'statusCode': 200,
-        'body': json.dumps(relevant_incidents)
+        'body': json.dumps(relevant_incidents, separators=(',', ':'))
     }
 
 def haversine_distance(lat1, lon1, lat2, lon2):
@@ -79,7 +95,7 @@ def is_relevant(geometry, search_point):
 
 
 def lambda_handler(event, context):
-    logging.info(f"{event=}")
+    logger.info("event=%s", event)
 
     agent = event["agent"]
     actionGroup = event["actionGroup"]
@@ -87,7 +103,7 @@ def lambda_handler(event, context):
     parameters = event.get("parameters", [])
     responseBody = {"TEXT": {"body": "Error, no function was called"}}
 
-    logger.info(f"{actionGroup=}, {function=}, {parameters=}")
+    logger.info("actionGroup=%s, function=%s, parameters=%s", actionGroup, function, parameters)
 
     if function in FUNCTION_NAMES:
         if function == "emvalert":
@@ -112,7 +128,7 @@ def lambda_handler(event, context):
             else:
                 print(f"'{lat}','{long}'")
                 forecast = emvalert(lat, long)
-                logger.debug(f"EV Alerts {forecast=}")
+                logger.debug("EV Alerts forecast=%s", forecast)
                 responseBody = {
                     "TEXT": {
                         "body": f"Here are the emergency alerts at : {forecast} "
@@ -130,6 +146,6 @@ def lambda_handler(event, context):
         "messageVersion": event["messageVersion"],
     }
 
-    logger.debug(f"lambda_handler: {function_response=}")
+    logger.debug("lambda_handler: function_response=%s", function_response)
 
     return function_response
\ No newline at end of file
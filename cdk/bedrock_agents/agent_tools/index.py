@@ -0,0 +1,43 @@
+import logging
+import os
+
+# Configured once here, before the tool modules create their loggers
+logging.basicConfig(
+    format="[%(asctime)s] p%(process)s {%(filename)s:%(lineno)d} %(levelname)s - %(message)s"
+)
+
+import emergency_alert
+import location_alert
+import weather_agent
+
+
+log_level = os.environ.get("LOG_LEVEL", "INFO").strip().upper()
+logger = logging.getLogger(__name__)
+logger.setLevel(log_level)
+
+# Bedrock action group name -> tool handler, all served from one warm container
+ACTION_GROUP_HANDLERS = {
+    "WeatherForecast": weather_agent.lambda_handler,
+    "LocationAlerts": location_alert.lambda_handler,
+    "EmergencyAlerts": emergency_alert.lambda_handler,
+}
+
+
+def lambda_handler(event, context):
+    actionGroup = event.get("actionGroup")
+    handler = ACTION_GROUP_HANDLERS.get(actionGroup)
+
+    if handler:
+        return handler(event, context)
+
+    logger.error(f"No tool registered for {actionGroup=}")
+    return {
+        "response": {
+            "actionGroup": actionGroup,
+            "function": event.get("function"),
+            "functionResponse": {
+                "responseBody": {"TEXT": {"body": f"Error, unknown action group '{actionGroup}'"}}
+            },
+        },
+        "messageVersion": event.get("messageVersion", "1.0"),
+    }
@@ -1,15 +1,18 @@
 import json
 import boto3
+from botocore.config import Config
 import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from boto3.dynamodb.conditions import Key
 from datetime import datetime
 
+from ddb_batch import batch_get_items
+from ttl_cache import TTLCache
+
 
 log_level = os.environ.get("LOG_LEVEL", "INFO").strip().upper()
-logging.basicConfig(
-    format="[%(asctime)s] p%(process)s {%(filename)s:%(lineno)d} %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 logger.setLevel(log_level)
 
@@ -20,48 +23,84 @@ try:
 except Exception as e:
     api_key = None
 
-dynamodb = boto3.resource('dynamodb')
+DDB_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 2},
+    connect_timeout=1,
+    read_timeout=3,
+    max_pool_connections=10
+)
+WORK_ORDERS_TABLE_NAME = os.environ['WORK_ORDERS_TABLE_NAME']
+LOCATIONS_TABLE_NAME = os.environ['LOCATIONS_TABLE_NAME']
+LOCATION_HAZARDS_TABLE_NAME = os.environ['LOCATION_HAZARDS_TABLE_NAME']
+HAZARDS_TABLE_NAME = os.environ['HAZARDS_TABLE_NAME']
+CONTROL_MEASURES_TABLE_NAME = os.environ['CONTROL_MEASURES_TABLE_NAME']
+INCIDENTS_TABLE_NAME = os.environ['INCIDENTS_TABLE_NAME']
+
+# boto3 resources are not thread-safe, so the handler thread and each executor thread
+# keep their own; they live for the execution environment so warm invocations reuse
+# the open connections
+_thread_local = threading.local()
+
+def get_dynamodb():
+    dynamodb = getattr(_thread_local, 'dynamodb', None)
+    if dynamodb is None:
+        dynamodb = _thread_local.dynamodb = boto3.session.Session().resource('dynamodb', config=DDB_CONFIG)
+    return dynamodb
+
+def get_table(table_name):
+    return get_dynamodb().Table(table_name)
+
+# boto3 releases the GIL while waiting on DynamoDB, so independent reads run in parallel
+executor = ThreadPoolExecutor(max_workers=4)
+
+# Hazards and incidents for a work order change rarely within a shift
+LOCATION_ALERTS_TTL_SECONDS = 900
+_CACHE = TTLCache(maxsize=512)
 
 def get_work_order(work_order_id):
-    work_orders_table = dynamodb.Table(os.environ['WORK_ORDERS_TABLE_NAME'])
-    return work_orders_table.get_item(
+    return get_table(WORK_ORDERS_TABLE_NAME).get_item(
         Key={'work_order_id': work_order_id}
     ).get('Item', {})
 
 def get_location_details(location_name):
-    locations_table = dynamodb.Table(os.environ['LOCATIONS_TABLE_NAME'])
-    return locations_table.get_item(
+    return get_table(LOCATIONS_TABLE_NAME).get_item(
         Key={'location_name': location_name}
     ).get('Item', {})
 
+def get_control_measures(location_hazard_id):
+    # The index is sorted by implementation_date, so DynamoDB returns the most recent first
+    return get_table(CONTROL_MEASURES_TABLE_NAME).query(
+        IndexName='LocationHazardDateIndex',
+        KeyConditionExpression=Key('location_hazard_id').eq(location_hazard_id),
+        ScanIndexForward=False
+    )['Items']
+
 def get_hazards_for_location(location_name):
-    location_hazards_table = dynamodb.Table(os.environ['LOCATION_HAZARDS_TABLE_NAME'])
-    hazards_table = dynamodb.Table(os.environ['HAZARDS_TABLE_NAME'])
-    control_measures_table = dynamodb.Table(os.environ['CONTROL_MEASURES_TABLE_NAME'])
     
-    location_hazards = location_hazards_table.query(
+    location_hazards = get_table(LOCATION_HAZARDS_TABLE_NAME).query(
         KeyConditionExpression=Key('location_name').eq(location_name)
     )['Items']
+
+    # Hydrate all hazards in one round trip while the control measure queries run alongside
+    hazards_future = executor.submit(
+        lambda: batch_get_items(get_dynamodb(), HAZARDS_TABLE_NAME, 'hazard_id', [lh['hazard_id'] for lh in location_hazards])
+    )
+    control_measures_by_hazard = list(executor.map(
+        get_control_measures, [lh['location_hazard_id'] for lh in location_hazards]
+    ))
+    hazards = hazards_future.result()
     
     enriched_hazards = []
-    for loc_hazard in location_hazards:
-        hazard = hazards_table.get_item(
-            Key={'hazard_id': loc_hazard['hazard_id']}
-        ).get('Item', {})
-        
-        control_measures = control_measures_table.query(
-            IndexName='LocationHazardIndex',
-            KeyConditionExpression=Key('location_hazard_id').eq(loc_hazard['location_hazard_id'])
-        )['Items']
-        
-        control_measures.sort(key=lambda x: x['implementation_date'], reverse=True)
+    for loc_hazard, control_measures in zip(location_hazards, control_measures_by_hazard):
+        hazard = hazards.get(loc_hazard['hazard_id'], {})
         
         enriched_hazard = {
             'location_hazard_details': loc_hazard,
             'hazard_details': hazard,
             'control_measures': control_measures,
             'total_control_measures': len(control_measures),
-            'active_control_measures': len([cm for cm in control_measures if cm['status'] == 'Active'])
+            'active_control_measures': sum(1 for cm in control_measures if cm['status'] == 'Active')
         }
         enriched_hazards.append(enriched_hazard)
     
@@ -74,14 +113,12 @@ def get_hazards_for_location(location_name):
     return enriched_hazards
 
 def get_incidents_for_location(location_name):
-    incidents_table = dynamodb.Table(os.environ['INCIDENTS_TABLE_NAME'])
-    incidents = incidents_table.query(
-        IndexName='LocationIndex',
-        KeyConditionExpression=Key('location_name').eq(location_name)
+    # The index is sorted by incident_date, so DynamoDB returns newest first
+    return get_table(INCIDENTS_TABLE_NAME).query(
+        IndexName='LocationDateIndex',
+        KeyConditionExpression=Key('location_name').eq(location_name),
+        ScanIndexForward=False
     )['Items']
-    
-    incidents.sort(key=lambda x: x['incident_date'], reverse=True)
-    return incidents
 
 def fetch_location_alerts(work_order_id):
     try:
@@ -90,7 +127,7 @@ def fetch_location_alerts(work_order_id):
                 'statusCode': 400,
                 'body': json.dumps({
                     'error': 'Work order ID is required'
-                })
+                }, separators=(',', ':'))
             }
         
         # Get work order details
@@ -100,7 +137,7 @@ def fetch_location_alerts(work_order_id):
                 'statusCode': 404,
                 'body': json.dumps({
                     'error': f'Work order {work_order_id} not found'
-                })
+                }, separators=(',', ':'))
             }
         
         location_name = work_order.get('location_name')
@@ -109,21 +146,22 @@ def fetch_location_alerts(work_order_id):
                 'statusCode': 404,
                 'body': json.dumps({
                     'error': f'Location not found for work order {work_order_id}'
-                })
+                }, separators=(',', ':'))
             }
         
-        # Get location details
-        location = get_location_details(location_name)
+        # Get location details and incidents in the background
+        location_future = executor.submit(get_location_details, location_name)
+        incidents_future = executor.submit(get_incidents_for_location, location_name)
         
         # Get hazards and control measures
         hazards = get_hazards_for_location(location_name)
         
-        # Get incidents
-        incidents = get_incidents_for_location(location_name)
+        location = location_future.result()
+        incidents = incidents_future.result()
         
         summary = {
             'total_hazards': len(hazards),
-            'high_risk_hazards': len([h for h in hazards if h['location_hazard_details']['risk_level'] == 'High']),
+            'high_risk_hazards': sum(1 for h in hazards if h['location_hazard_details']['risk_level'] == 'High'),
             'total_incidents': len(incidents),
             'total_control_measures': sum(h['total_control_measures'] for h in hazards),
             'active_control_measures': sum(h['active_control_measures'] for h in hazards)
@@ -140,7 +178,7 @@ def fetch_location_alerts(work_order_id):
         
         return {
             'statusCode': 200,
-            'body': json.dumps(response, default=str)
+            'body': json.dumps(response, default=str, separators=(',', ':'))
         }
         
     except Exception as e:
@@ -149,12 +187,12 @@ def fetch_location_alerts(work_order_id):
             'statusCode': 500,
             'body': json.dumps({
                 'error': f'Error querying data: {str(e)}'
-            })
+            }, separators=(',', ':'))
         }
 
 
 def lambda_handler(event, context):
-    logging.info(f"{event=}")
+    logger.info("event=%s", event)
 
     agent = event["agent"]
     actionGroup = event["actionGroup"]
@@ -162,7 +200,7 @@ def lambda_handler(event, context):
     parameters = event.get("parameters", [])
     responseBody = {"TEXT": {"body": "Error, no function was called"}}
 
-    logger.info(f"{actionGroup=}, {function=}, {parameters=}")
+    logger.info("actionGroup=%s, function=%s, parameters=%s", actionGroup, function, parameters)
 
     if function in FUNCTION_NAMES:
         if function == "fetch_location_alerts":
@@ -181,8 +219,13 @@ def lambda_handler(event, context):
                 }
             else:
                 print(f"'{work_order_id}'")
-                location_alert = fetch_location_alerts(work_order_id)
-                logger.debug(f"Hazards at location {location_alert=}")
+                location_alert = _CACHE.get(work_order_id, LOCATION_ALERTS_TTL_SECONDS)
+                if location_alert is None:
+                    location_alert = fetch_location_alerts(work_order_id)
+                    # Only successful lookups are reused; errors are retried on the next call
+                    if location_alert['statusCode'] == 200:
+                        _CACHE.set(work_order_id, location_alert)
+                logger.debug("Hazards at location location_alert=%s", location_alert)
                 responseBody = {
                     "TEXT": {
                         "body": f"Here are the alerts at the location for workorder '{work_order_id}' : {location_alert} "
@@ -200,6 +243,6 @@ def lambda_handler(event, context):
         "messageVersion": event["messageVersion"],
     }
 
-    logger.debug(f"lambda_handler: {function_response=}")
+    logger.debug("lambda_handler: function_response=%s", function_response)
 
     return function_response
@@ -0,0 +1,267 @@
+import urllib3
+import logging
+import math
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+import orjson
+
+from ttl_cache import TTLCache
+
+# orjson parses bytes directly; Bedrock expects the response body as str
+def jdumps(obj):
+    return orjson.dumps(obj).decode()
+
+jloads = orjson.loads
+
+log_level = os.environ.get("LOG_LEVEL", "INFO").strip().upper()
+logger = logging.getLogger(__name__)
+logger.setLevel(log_level)
+
+# Keep outbound calls well inside the Lambda timeout so a hung API fails fast
+HTTP_TIMEOUT = urllib3.Timeout(connect=1, read=3)
+# One retry still fits inside the 8 s function timeout
+HTTP_RETRIES = urllib3.Retry(total=1, backoff_factor=0.2)
+
+# Shared across warm invocations so the HTTPS connection is reused
+_HTTP = urllib3.PoolManager(num_pools=4, maxsize=8)
+
+FUNCTION_NAMES = ["weatherforecast"]  # No API key required for Open-Meteo
+
+# Weather code mapping for Open-Meteo (WMO codes 0-99)
+_WEATHER_CODES = {
+    0: "Clear sky",
+    1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
+    45: "Fog", 48: "Depositing rime fog",
+    51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
+    56: "Light freezing drizzle", 57: "Dense freezing drizzle",
+    61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
+    66: "Light freezing rain", 67: "Heavy freezing rain",
+    71: "Slight snow fall", 73: "Moderate snow fall", 75: "Heavy snow fall",
+    77: "Snow grains",
+    80: "Slight rain showers", 81: "Moderate rain showers", 82: "Violent rain showers",
+    85: "Slight snow showers", 86: "Heavy snow showers",
+    95: "Thunderstorm", 96: "Thunderstorm with slight hail", 99: "Thunderstorm with heavy hail"
+}
+_UNKNOWN_WEATHER = "Unknown weather condition"
+# Dense lookup table built once at import, indexed directly by weather code
+_WEATHER_DESC = tuple(_WEATHER_CODES.get(code, _UNKNOWN_WEATHER) for code in range(100))
+del _WEATHER_CODES
+
+def describe_weather(code):
+    return _WEATHER_DESC[code] if isinstance(code, int) and 0 <= code < 100 else _UNKNOWN_WEATHER
+
+_ISO_DATE_PREFIX = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Open-Meteo API URLs - no API key required. Current conditions do not depend on the
+# timezone so they are requested in UTC; daily aggregates need the site's local day
+_URL_CURRENT = (
+    "https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={long}"
+    "&current=temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m"
+    "&timezone=UTC"
+)
+_URL_DAILY = (
+    "https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={long}"
+    "&daily=temperature_2m_max,temperature_2m_min,weather_code,wind_speed_10m_max,relative_humidity_2m_mean"
+    "&start_date={date}&end_date={date}&timezone=auto"
+)
+
+# Open-Meteo responses cached per warm container, keyed by (lat, long, date, is_current),
+# as (body, etag, last_modified)
+CURRENT_WEATHER_TTL_SECONDS = 300
+DAILY_FORECAST_TTL_SECONDS = 3600
+_CACHE = TTLCache(maxsize=256)
+
+def fetch_forecast(url, cache_key, ttl):
+    """
+    Return the Open-Meteo JSON for url, served from the cache while fresh. Expired
+    entries are revalidated with the stored ETag / Last-Modified, so an unchanged
+    forecast comes back as a bodyless 304
+    """
+    cached = _CACHE.get(cache_key, ttl)
+    if cached is not None:
+        return cached[0]
+
+    headers = {}
+    stale = _CACHE.peek(cache_key)
+    if stale is not None:
+        _, etag, last_modified = stale
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    response = _HTTP.request('GET', url, headers=headers, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES)
+    if response.status == 304:
+        if stale is not None:
+            _CACHE.set(cache_key, stale)
+            return stale[0]
+        # Nothing to revalidate against, so ask for the full body
+        response = _HTTP.request('GET', url, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES)
+
+    # Only successful responses are cached; errors are retried on the next call
+    if response.status != 200:
+        raise ValueError(f"Open-Meteo returned HTTP {response.status}")
+
+    data = jloads(response.data)
+    _CACHE.set(cache_key, (data, response.headers.get('ETag'), response.headers.get('Last-Modified')))
+    return data
+
+def weatherforecast(lat, long, target_datetime):
+    try:
+        # Parse the target datetime; inputs without an offset are treated as UTC
+        target_dt = datetime.fromisoformat(target_datetime.replace('Z', '+00:00'))
+        if target_dt.tzinfo is None:
+            target_dt = target_dt.replace(tzinfo=timezone.utc)
+        current_dt = datetime.now(timezone.utc)
+        
+        # Calculate the difference in days
+        days_diff = (target_dt - current_dt).days
+        
+        # Open-Meteo API supports up to 16 days forecast
+        if days_diff > 16:
+            return {
+                'statusCode': 400,
+                'error': 'Forecast only available for up to 16 days'
+            }
+        
+        # Format date for Open-Meteo API (YYYY-MM-DD), reusing the ISO input's date part when present
+        if _ISO_DATE_PREFIX.match(target_datetime):
+            target_date = target_datetime[:10]
+        else:
+            target_date = target_dt.strftime('%Y-%m-%d')
+        
+        is_current = days_diff <= 0
+        url = (_URL_CURRENT if is_current else _URL_DAILY).format_map(
+            {'lat': lat, 'long': long, 'date': target_date}
+        )
+        
+        cache_key = (round(float(lat), 3), round(float(long), 3), target_date, is_current)
+        data = fetch_forecast(
+            url,
+            cache_key,
+            CURRENT_WEATHER_TTL_SECONDS if is_current else DAILY_FORECAST_TTL_SECONDS
+        )
+        
+        if is_current:  # Current weather
+            current = data.get('current', {})
+            weather_info = {
+                'datetime': current_dt.isoformat(),
+                'temperature': current.get('temperature_2m', 'N/A'),
+                'feels_like': current.get('apparent_temperature', 'N/A'),
+                'humidity': current.get('relative_humidity_2m', 'N/A'),
+                'wind_speed': current.get('wind_speed_10m', 'N/A'),
+                'weather_code': current.get('weather_code', 0),
+                'weather_description': describe_weather(current.get('weather_code', 0))
+            }
+        else:  # Future forecast
+            daily = data.get('daily', {})
+            if daily and len(daily.get('time', [])) > 0:
+                weather_info = {
+                    'datetime': target_dt.isoformat(),
+                    'temperature_max': daily.get('temperature_2m_max', [None])[0],
+                    'temperature_min': daily.get('temperature_2m_min', [None])[0],
+                    'humidity': daily.get('relative_humidity_2m_mean', [None])[0],
+                    'wind_speed': daily.get('wind_speed_10m_max', [None])[0],
+                    'weather_code': daily.get('weather_code', [0])[0],
+                    'weather_description': describe_weather(daily.get('weather_code', [0])[0])
+                }
+            else:
+                return {
+                    'statusCode': 404,
+                    'error': 'No forecast available for the specified date'
+                }
+        
+        return {
+            'statusCode': 200,
+            'data': weather_info
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in weatherforecast: {str(e)}")
+        return {
+            'statusCode': 500,
+            'error': f'Error fetching weather data: {str(e)}'
+        }
+
+def _validate(pmap):
+    """Check the weatherforecast parameters, returning (error_msg, normalized)"""
+    missing_params = [name for name in ("lat", "long", "target_datetime") if not pmap.get(name)]
+    if missing_params:
+        return f"Missing mandatory parameter(s): {', '.join(missing_params)}", None
+
+    try:
+        lat = float(pmap["lat"])
+        long = float(pmap["long"])
+    except (TypeError, ValueError):
+        return "lat and long must be numbers", None
+    if not (math.isfinite(lat) and -90 <= lat <= 90):
+        return f"lat must be between -90 and 90, got {pmap['lat']}", None
+    if not (math.isfinite(long) and -180 <= long <= 180):
+        return f"long must be between -180 and 180, got {pmap['long']}", None
+
+    target_datetime = pmap["target_datetime"]
+    try:
+        target_dt = datetime.fromisoformat(target_datetime.replace('Z', '+00:00'))
+    except ValueError:
+        return f"target_datetime must be an ISO 8601 datetime, got {target_datetime}", None
+    if target_dt.tzinfo is None:
+        target_dt = target_dt.replace(tzinfo=timezone.utc)
+    if (target_dt - datetime.now(timezone.utc)).days > 16:
+        return "target_datetime must be within 16 days, the Open-Meteo forecast range", None
+
+    return None, {"lat": lat, "long": long, "target_datetime": target_datetime}
+
+def lambda_handler(event, context):
+    logger.info("event=%s", event)
+
+    agent = event["agent"]
+    actionGroup = event["actionGroup"]
+    function = event["function"]
+    parameters = event.get("parameters", [])
+    responseBody = {"TEXT": {"body": "Error, no function was called"}}
+
+    logger.info("actionGroup=%s, function=%s, parameters=%s", actionGroup, function, parameters)
+
+    if function in FUNCTION_NAMES:
+        if function == "weatherforecast":
+            pmap = {param["name"]: param.get("value") for param in parameters}
+            error_msg, normalized = _validate(pmap)
+            if error_msg:
+                # Reprompt so the model corrects the call instead of retrying it unchanged
+                action_response = {
+                    "actionGroup": actionGroup,
+                    "function": function,
+                    "functionResponse": {
+                        "responseState": "REPROMPT",
+                        "responseBody": {"TEXT": {"body": f"VALIDATION_ERROR: {error_msg}"}},
+                    },
+                }
+                return {"response": action_response, "messageVersion": event["messageVersion"]}
+
+            lat, long, target_datetime = normalized["lat"], normalized["long"], normalized["target_datetime"]
+            weather_response = weatherforecast(lat, long, target_datetime)
+            logger.debug("Weather forecast: weather_response=%s", weather_response)
+            # Hand the model one compact JSON document rather than JSON embedded in prose
+            result = {'coords': [lat, long], 'at': target_datetime}
+            if 'data' in weather_response:
+                result['weather'] = weather_response['data']
+            else:
+                result['error'] = weather_response['error']
+            responseBody = {"TEXT": {"body": jdumps(result)}}
+
+    action_response = {
+        "actionGroup": actionGroup,
+        "function": function,
+        "functionResponse": {"responseBody": responseBody},
+    }
+
+    function_response = {
+        "response": action_response,
+        "messageVersion": event["messageVersion"],
+    }
+
+    logger.debug("lambda_handler: function_response=%s", function_response)
+
+    return function_response
\ No newline at end of file
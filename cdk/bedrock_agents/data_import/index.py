@@ -3,16 +3,16 @@ import csv
 import json
 import os
 import io
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import cfnresponse
 
-dynamodb = boto3.resource('dynamodb')
+s3_client = boto3.client('s3')
 
-def get_table(table_name):
+def get_table(dynamodb, table_name):
     return dynamodb.Table(os.environ.get(f'{table_name}_TABLE_NAME'))
 
 def read_csv_from_s3(bucket_name, key):
-    s3_client = boto3.client('s3')
     try:
         response = s3_client.get_object(Bucket=bucket_name, Key=key)
         return list(csv.DictReader(io.TextIOWrapper(response['Body'], encoding='utf-8')))
@@ -73,6 +73,22 @@ def batch_write_items(table, items):
         for item in items:
             batch.put_item(Item=item)
 
+def import_table(s3_bucket, table_name, file_name):
+    items = read_csv_from_s3(s3_bucket, file_name)
+    if not items:
+        return 0
+
+    # Update work order dates if this is the work_orders table
+    if table_name == 'work_orders':
+        items = update_work_order_dates(items)
+
+    # Tables are imported from worker threads and boto3 resources are not thread-safe,
+    # so each import builds its own from a private session
+    dynamodb = boto3.session.Session().resource('dynamodb')
+    table = get_table(dynamodb, table_name.upper())
+    batch_write_items(table, items)
+    return len(items)
+
 def handler(event, context):
     try:
         # Check if this is a CloudFormation custom resource request
@@ -102,17 +118,17 @@ def handler(event, context):
             'control_measures': 'control_measures.csv'
         }
         
-        results = {}
-        for table_name, file_name in csv_files.items():
-            items = read_csv_from_s3(s3_bucket, file_name)
-            if items:
-                # Update work order dates if this is the work_orders table
-                if table_name == 'work_orders':
-                    items = update_work_order_dates(items)
-                    
-                table = get_table(table_name.upper())
-                batch_write_items(table, items)
-                results[table_name] = len(items)
+        # The tables are independent, so load them all at once; each import is network-bound
+        with ThreadPoolExecutor(max_workers=len(csv_files)) as executor:
+            futures = {
+                table_name: executor.submit(import_table, s3_bucket, table_name, file_name)
+                for table_name, file_name in csv_files.items()
+            }
+            results = {}
+            for table_name, future in futures.items():
+                count = future.result()
+                if count:
+                    results[table_name] = count
         
         response_data = {
             'message': 'Data import completed successfully',
@@ -24,6 +24,7 @@ class CoreCognito(Construct):
     ):
         super().__init__(scope, construct_id, **kwargs)
 
+        stack_name = Stack.of(self).stack_name
 
         self.user_pool = cognito.UserPool(
             self,
@@ -63,7 +64,7 @@ class CoreCognito(Construct):
             self,
             "UserPoolId",
             value=self.user_pool.user_pool_id,
-            export_name=f"{Stack.of(self).stack_name}{construct_id}UserPoolId",
+            export_name=f"{stack_name}{construct_id}UserPoolId",
         )
 
         self.user_pool_client = cognito.UserPoolClient(
@@ -84,7 +85,7 @@ class CoreCognito(Construct):
             self,
             "UserPoolClientId",
             value=self.user_pool_client.user_pool_client_id,
-            export_name=f"{Stack.of(self).stack_name}{construct_id}UserPoolClientId",
+            export_name=f"{stack_name}{construct_id}UserPoolClientId",
         )
 
         self.identity_pool = cognito.CfnIdentityPool(
@@ -100,7 +101,7 @@ class CoreCognito(Construct):
             self,
             "IdentityPoolId",
             value=self.identity_pool.ref,
-            export_name=f"{Stack.of(self).stack_name}{construct_id}IdentityPoolId",
+            export_name=f"{stack_name}{construct_id}IdentityPoolId",
         )
 
         self.auth_user_role = iam.Role(
@@ -52,7 +52,11 @@ class DataInfrastructureStack(NestedStack):
         data_bucket = s3.Bucket(
             self,
             "DataBucket",
-            versioned=True,
+            # Sample data is redeployed from source, so old object versions are never needed
+            versioned=False,
+            lifecycle_rules=[
+                s3.LifecycleRule(abort_incomplete_multipart_upload_after=Duration.days(1))
+            ],
             encryption=s3.BucketEncryption.S3_MANAGED,
             removal_policy=RemovalPolicy.DESTROY,
             auto_delete_objects=True,  # Enable auto-deletion of objects when bucket is deleted
@@ -78,7 +82,9 @@ class DataInfrastructureStack(NestedStack):
              sources=[s3deploy.Source.asset("../data", exclude=["**/*", "!**/*.csv"])],
              destination_bucket=data_bucket,
              log_retention=logs.RetentionDays.ONE_WEEK,
-             memory_limit=512
+             memory_limit=512,
+             # Only CSVs are deployed and files are never renamed, so skip the delete sweep
+             prune=False
         )
         
         # The stack-level suppression will handle the L1 error for the BucketDeployment Lambda
@@ -94,7 +100,10 @@ class DataInfrastructureStack(NestedStack):
             apply_to_children=True
         )
 
-        # Create DynamoDB Tables
+        # Create DynamoDB Tables. A stack update can create or delete only one GSI per table,
+        # and a projection change counts as a delete plus a create, so deployments made before
+        # the current index layout must be destroyed and redeployed (see "Upgrading an
+        # Existing Deployment" in the README)
         work_orders_table = dynamodb.Table(
             self,
             "WorkOrdersTable",
@@ -113,7 +122,9 @@ class DataInfrastructureStack(NestedStack):
                 name="location_name",
                 type=dynamodb.AttributeType.STRING
             ),
-            projection_type=dynamodb.ProjectionType.ALL
+            # Enough to list a site's work orders; fetch the full row by key when needed
+            projection_type=dynamodb.ProjectionType.INCLUDE,
+            non_key_attributes=["status", "scheduled_start_timestamp"]
         )
 
         locations_table = dynamodb.Table(
@@ -146,7 +157,8 @@ class DataInfrastructureStack(NestedStack):
                 name="location_name",
                 type=dynamodb.AttributeType.STRING
             ),
-            projection_type=dynamodb.ProjectionType.ALL
+            # No reader queries this index for full items, so project only the keys
+            projection_type=dynamodb.ProjectionType.KEYS_ONLY
         )
 
         incidents_table = dynamodb.Table(
@@ -161,12 +173,18 @@ class DataInfrastructureStack(NestedStack):
             removal_policy=RemovalPolicy.DESTROY,
         )
         
+        # Incidents for a location ordered by date, so readers can page newest first.
+        # This is the only location index on the table; it also serves plain location lookups
         incidents_table.add_global_secondary_index(
-            index_name="LocationIndex",
+            index_name="LocationDateIndex",
             partition_key=dynamodb.Attribute(
                 name="location_name",
                 type=dynamodb.AttributeType.STRING
             ),
+            sort_key=dynamodb.Attribute(
+                name="incident_date",
+                type=dynamodb.AttributeType.STRING
+            ),
             projection_type=dynamodb.ProjectionType.ALL
         )
 
@@ -182,12 +200,18 @@ class DataInfrastructureStack(NestedStack):
             removal_policy=RemovalPolicy.DESTROY,
         )
         
+        # Control measures for a location hazard ordered by implementation date, so readers
+        # get the most recent measures first without sorting client side
         control_measures_table.add_global_secondary_index(
-            index_name="LocationHazardIndex",
+            index_name="LocationHazardDateIndex",
             partition_key=dynamodb.Attribute(
                 name="location_hazard_id",
                 type=dynamodb.AttributeType.STRING
             ),
+            sort_key=dynamodb.Attribute(
+                name="implementation_date",
+                type=dynamodb.AttributeType.STRING
+            ),
             projection_type=dynamodb.ProjectionType.ALL
         )
 
@@ -202,15 +226,6 @@ class DataInfrastructureStack(NestedStack):
             ),
             removal_policy=RemovalPolicy.DESTROY,
         )
-        
-        assets_table.add_global_secondary_index(
-            index_name="LocationIndex",
-            partition_key=dynamodb.Attribute(
-                name="location_name",
-                type=dynamodb.AttributeType.STRING
-            ),
-            projection_type=dynamodb.ProjectionType.ALL
-        )
 
         location_hazards_table = dynamodb.Table(
             self,
@@ -234,7 +249,8 @@ class DataInfrastructureStack(NestedStack):
                 name="hazard_id",
                 type=dynamodb.AttributeType.STRING
             ),
-            projection_type=dynamodb.ProjectionType.ALL
+            # No reader queries this index for full items, so project only the keys
+            projection_type=dynamodb.ProjectionType.KEYS_ONLY
         )
 
         # Create Lambda execution role for data import
@@ -333,7 +349,7 @@ class DataInfrastructureStack(NestedStack):
             "DataImportFunction",
             runtime=lambda_.Runtime.PYTHON_3_13,
             handler="index.handler",
-            code=lambda_.Code.from_asset("./bedrock_agents/data_import"),
+            code=lambda_.Code.from_asset("./bedrock_agents/data_import", exclude=["__pycache__", "*.pyc"]),
             role=lambda_execution_role,
             timeout=Duration.seconds(300),
             memory_size=256,
@@ -396,59 +412,52 @@ class DataInfrastructureStack(NestedStack):
         self.location_hazards_table_name = location_hazards_table.table_name
         self.control_measures_table_name = control_measures_table.table_name
 
-        # Add outputs
+        # Add outputs for reference only; other stacks use the construct attributes above,
+        # so nothing is exported
         CfnOutput(
             self,
             "DataBucketName",
-            value=data_bucket.bucket_name,
-            export_name=f"{construct_id}-DataBucketName"
+            value=data_bucket.bucket_name
         )
         
         CfnOutput(
             self,
             "WorkOrdersTableName",
-            value=work_orders_table.table_name,
-            export_name=f"{construct_id}-WorkOrdersTableName"
+            value=work_orders_table.table_name
         )
         
         CfnOutput(
             self,
             "LocationsTableName",
-            value=locations_table.table_name,
-            export_name=f"{construct_id}-LocationsTableName"
+            value=locations_table.table_name
         )
         
         CfnOutput(
             self,
             "HazardsTableName",
-            value=hazards_table.table_name,
-            export_name=f"{construct_id}-HazardsTableName"
+            value=hazards_table.table_name
         )
         
         CfnOutput(
             self,
             "IncidentsTableName",
-            value=incidents_table.table_name,
-            export_name=f"{construct_id}-IncidentsTableName"
+            value=incidents_table.table_name
         )
         
         CfnOutput(
             self,
             "AssetsTableName",
-            value=assets_table.table_name,
-            export_name=f"{construct_id}-AssetsTableName"
+            value=assets_table.table_name
         )
         
         CfnOutput(
             self,
             "LocationHazardsTableName",
-            value=location_hazards_table.table_name,
-            export_name=f"{construct_id}-LocationHazardsTableName"
+            value=location_hazards_table.table_name
         )
         
         CfnOutput(
             self,
             "ControlMeasuresTableName",
-            value=control_measures_table.table_name,
-            export_name=f"{construct_id}-ControlMeasuresTableName"
+            value=control_measures_table.table_name
         )
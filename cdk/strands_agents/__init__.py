@@ -13,6 +13,7 @@ from aws_cdk import (
     aws_iam as iam,
     aws_logs as logs,
     aws_dynamodb as dynamodb,
+    aws_ecr_assets as ecr_assets,
 )
 from constructs import Construct
 from cdk_nag import NagSuppressions, NagPackSuppression
@@ -146,7 +147,7 @@ class StrandsAgentsStack(NestedStack):
             )
         )
         
-        # Add permissions for Bedrock inference profiles
+        # Add permissions to invoke and manage inference profiles
         lambda_execution_role.add_to_policy(
             iam.PolicyStatement(
                 sid="BedrockInferenceProfileAccess",
@@ -154,21 +155,7 @@ class StrandsAgentsStack(NestedStack):
                 actions=[
                     "bedrock:InvokeModel",
                     "bedrock:InvokeModelWithResponseStream",
-                    "bedrock:CreateInferenceProfile"
-                ],
-                resources=[
-                    "arn:aws:bedrock:*:*:inference-profile/*",
-                    "arn:aws:bedrock:*:*:application-inference-profile/*"
-                ]
-            )
-        )
-        
-        # Add permissions to manage inference profiles
-        lambda_execution_role.add_to_policy(
-            iam.PolicyStatement(
-                sid="BedrockInferenceProfileManagement",
-                effect=iam.Effect.ALLOW,
-                actions=[
+                    "bedrock:CreateInferenceProfile",
                     "bedrock:GetInferenceProfile",
                     "bedrock:ListInferenceProfiles",
                     "bedrock:DeleteInferenceProfile",
@@ -192,16 +179,31 @@ class StrandsAgentsStack(NestedStack):
             removal_policy=RemovalPolicy.DESTROY
         )
 
+        # Share the image build cache through a registry when one is configured,
+        # e.g. --context docker_cache_ref=<account>.dkr.ecr.<region>.amazonaws.com/strands-cache:latest
+        docker_cache_ref = self.node.try_get_context("docker_cache_ref")
+        docker_cache_options = {}
+        if docker_cache_ref:
+            docker_cache_options = {
+                "cache_from": [ecr_assets.DockerCacheOption(type="registry", params={"ref": docker_cache_ref})],
+                "cache_to": ecr_assets.DockerCacheOption(type="registry", params={"ref": docker_cache_ref, "mode": "max"}),
+            }
+
         # Create Strands Supervisor Lambda Function using Docker container
         strands_supervisor_function = lambda_.DockerImageFunction(
             self,
             "StrandsSupervisorFunction",
             function_name=f"{construct_id.lower()}-strands-supervisor",
-            code=lambda_.DockerImageCode.from_image_asset("./strands_agents/supervisor_agent"),
+            code=lambda_.DockerImageCode.from_image_asset(
+                "./strands_agents/supervisor_agent",
+                # The Lambda base image is multi-arch; build the Graviton variant
+                platform=ecr_assets.Platform.LINUX_ARM64,
+                **docker_cache_options
+            ),
             description="Strands-based safety supervisor agent",
             timeout=Duration.seconds(180),
             memory_size=1024,
-            architecture=lambda_.Architecture.X86_64,
+            architecture=lambda_.Architecture.ARM_64,
             role=lambda_execution_role,
             environment={
                 "COLLABORATOR_MODEL": collaborator_foundation_model,
@@ -213,7 +215,7 @@ class StrandsAgentsStack(NestedStack):
                 "ASSETS_TABLE": assets_table.table_name,
                 "LOCATION_HAZARDS_TABLE": location_hazards_table.table_name,
                 "CONTROL_MEASURES_TABLE": control_measures_table.table_name,
-                "LOG_LEVEL": "INFO"
+                "LOG_LEVEL": "WARNING"
             }
         )
 
@@ -228,11 +230,23 @@ class StrandsAgentsStack(NestedStack):
             ]
         )
 
+        # Warm containers for the interactive path, set with `--context strands_pc_count=N`.
+        # Container images cannot use SnapStart, so this is the cold-start control here
+        strands_provisioned_concurrency = int(self.node.try_get_context("strands_pc_count") or 0)
+        strands_supervisor_alias = lambda_.Alias(
+            self,
+            "StrandsSupervisorLiveAlias",
+            alias_name="live",
+            version=strands_supervisor_function.current_version,
+            provisioned_concurrent_executions=strands_provisioned_concurrency or None
+        )
+
         # Store references to resources for outputs
         self.work_orders_table_name = work_orders_table.table_name
         self.locations_table_name = locations_table.table_name
         self.supervisor_function_name = strands_supervisor_function.function_name
         self.supervisor_function_arn = strands_supervisor_function.function_arn
+        self.supervisor_alias_arn = strands_supervisor_alias.function_arn
 
         # Create outputs for compatibility with existing backend (function outputs only)
         CfnOutput(
@@ -0,0 +1,36 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_RETRIES = 5
+
+
+def batch_get_items(dynamodb, table_name, key_name, key_values, **table_options):
+    """
+    Fetch items by key with BatchGetItem, retrying unprocessed keys with backoff.
+    Returns the items keyed by their key_name value; table_options such as
+    ProjectionExpression are passed through with each request
+    """
+    items = {}
+    unique_values = list(dict.fromkeys(key_values))
+    for start in range(0, len(unique_values), BATCH_GET_MAX_KEYS):
+        request_items = {
+            table_name: {
+                'Keys': [{key_name: key_value} for key_value in unique_values[start:start + BATCH_GET_MAX_KEYS]],
+                **table_options
+            }
+        }
+        for attempt in range(BATCH_GET_MAX_RETRIES):
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response['Responses'].get(table_name, []):
+                items[item[key_name]] = item
+            request_items = response.get('UnprocessedKeys')
+            if not request_items:
+                break
+            time.sleep(0.05 * (2 ** attempt))
+        else:
+            logger.warning(f"Unprocessed {table_name} keys after {BATCH_GET_MAX_RETRIES} attempts: {request_items}")
+    return items
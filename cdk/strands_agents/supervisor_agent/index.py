@@ -1,10 +1,26 @@
-import json
+import asyncio
+import base64
+import gzip
+import itertools
+import math
 import os
 import logging
+import time
 import boto3
-from datetime import datetime
+import ijson
+import numpy as np
+import orjson
+import urllib3
+from boto3.dynamodb.conditions import Key
+from botocore.config import Config
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
+import queue
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ddb_batch import batch_get_items
+from ttl_cache import TTLCache
 
 # Configure logging
 log_level = os.environ.get("LOG_LEVEL", "INFO").strip().upper()
@@ -14,6 +30,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.setLevel(log_level)
 
+# orjson's C encoder handles datetime and numpy natively; Decimal goes through default=str
+def jdumps(obj):
+    return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+# Parses the response bytes directly, skipping the UTF-8 decode copy
+jloads = orjson.loads
+
 # Import Strands SDK
 try:
     from strands import Agent, tool
@@ -39,8 +62,71 @@ ASSETS_TABLE = os.environ.get("ASSETS_TABLE")
 LOCATION_HAZARDS_TABLE = os.environ.get("LOCATION_HAZARDS_TABLE")
 CONTROL_MEASURES_TABLE = os.environ.get("CONTROL_MEASURES_TABLE")
 
-# Initialize AWS clients
-dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+# Shared client tuning: the pool is sized for the concurrent hazard enrichment queries, and
+# short timeouts with adaptive retries surface a slow dependency instead of a 60 s hang
+AWS_CLIENT_CONFIG = Config(
+    region_name=AWS_REGION,
+    max_pool_connections=50,
+    connect_timeout=5,
+    read_timeout=10,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# boto3 resources are not thread-safe, and the tools query DynamoDB from the handler,
+# prefetch and _DDB_EXECUTOR threads, so each thread keeps its own resource for the
+# lifetime of the execution environment
+_ddb_local = threading.local()
+
+def get_dynamodb():
+    dynamodb = getattr(_ddb_local, 'dynamodb', None)
+    if dynamodb is None:
+        dynamodb = _ddb_local.dynamodb = boto3.session.Session().resource('dynamodb', config=AWS_CLIENT_CONFIG)
+    return dynamodb
+
+def get_table(table_name):
+    return get_dynamodb().Table(table_name)
+
+# Shared across warm invocations so the Open-Meteo and emergency feed connections are reused
+HTTP = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=16,
+    retries=urllib3.Retry(total=2, backoff_factor=0.2),
+    timeout=urllib3.Timeout(connect=2.0, read=8.0)
+)
+
+# Attributes the hazard summary actually reports; status and description go through
+# attribute name placeholders so they cannot collide with DynamoDB reserved words
+LOCATION_HAZARD_PROJECTION = 'location_hazard_id, hazard_id, risk_level, #s, last_review_date'
+HAZARD_PROJECTION = 'hazard_id, hazard_name, hazard_category, #d, severity_level'
+CONTROL_MEASURE_PROJECTION = 'control_measure_id, measure_description, implementation_date, #s, responsible_person, effectiveness_rating'
+
+# Key condition builders for the fixed partition key attributes, created once at import
+_KEY_LOCATION_NAME = Key('location_name')
+_KEY_LOCATION_HAZARD_ID = Key('location_hazard_id')
+
+# Most recent records reported per work order; the date-keyed indexes return them newest first.
+# The summary totals still cover every record: a list that fills its limit is counted separately
+CONTROL_MEASURES_LIMIT = 20
+INCIDENTS_LIMIT = 50
+
+# boto3 releases the GIL while waiting on DynamoDB, so independent reads run in parallel
+_DDB_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+def count_query(table_name, **kwargs):
+    """Run a Select='COUNT' query across all pages, returning (Count, ScannedCount) totals"""
+    count = scanned_count = 0
+    while True:
+        response = get_table(table_name).query(Select='COUNT', **kwargs)
+        count += response['Count']
+        scanned_count += response['ScannedCount']
+        if 'LastEvaluatedKey' not in response:
+            return count, scanned_count
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def drop_empty(item):
+    """Strip None, '' and 'N/A' attributes so sparse DynamoDB items cost fewer tokens"""
+    return {k: v for k, v in item.items() if v not in (None, '', 'N/A')}
 
 # Global variable to store streaming callback
 streaming_callback = None
@@ -50,44 +136,112 @@ import threading
 # Thread-local storage for WebSocket connections (secure for concurrent users)
 thread_local_data = threading.local()
 
+# Trace updates and report chunks are queued by the producing threads and posted by one
+# background flusher, so neither a tool nor the token stream blocks on the WebSocket round
+# trip. Updates arriving within the coalescing window share frames per connection: runs of
+# traces become one trace_batch frame and runs of chunks one concatenated chunk frame
+TRACE_COALESCE_SECONDS = 0.02
+_trace_queue = queue.Queue()
+
+def _post_traces(connection_id, api_gateway_management_api, updates):
+    """Post queued (kind, payload) updates to one connection, coalescing runs of the same kind"""
+    for kind, group in itertools.groupby(updates, key=lambda update: update[0]):
+        payloads = [payload for _, payload in group]
+        if kind == 'chunk':
+            message = {'type': 'chunk', 'content': ''.join(payloads), 'agentFramework': 'StrandsSDK'}
+        elif len(payloads) == 1:
+            message = {'type': 'trace', 'content': payloads[0], 'agentFramework': 'StrandsSDK'}
+        else:
+            message = {'type': 'trace_batch', 'content': payloads, 'agentFramework': 'StrandsSDK'}
+        try:
+            api_gateway_management_api.post_to_connection(ConnectionId=connection_id, Data=jdumps(message))
+        except Exception as e:
+            logger.error(f"Error sending WebSocket message to {connection_id}: {str(e)}")
+
+def _trace_flusher():
+    while True:
+        batch = [_trace_queue.get()]
+        deadline = time.monotonic() + TRACE_COALESCE_SECONDS
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                batch.append(_trace_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        # Group by connection, keeping the order the updates were produced in
+        by_connection = {}
+        for connection_id, api_gateway_management_api, kind, payload in batch:
+            by_connection.setdefault(connection_id, (api_gateway_management_api, []))[1].append((kind, payload))
+        for connection_id, (api_gateway_management_api, updates) in by_connection.items():
+            _post_traces(connection_id, api_gateway_management_api, updates)
+        
+        for _ in batch:
+            _trace_queue.task_done()
+
+threading.Thread(target=_trace_flusher, name="trace-flusher", daemon=True).start()
+
+def flush_streaming_updates():
+    """Block until every queued update has been posted; call before the handler returns"""
+    _trace_queue.join()
+
+def send_streaming_chunk(text: str):
+    """Queue a piece of the generated report for the caller's WebSocket connection"""
+    connection_id = getattr(thread_local_data, 'connection_id', None)
+    api_gateway_management_api = getattr(thread_local_data, 'api_gateway_management_api', None)
+    if connection_id and api_gateway_management_api and text:
+        _trace_queue.put((connection_id, api_gateway_management_api, 'chunk', text))
+
 def send_streaming_update(update_type: str, content: str, tool_name: str = None):
-    """Send streaming updates directly to the correct WebSocket connection (thread-safe)"""
+    """Queue a streaming update for the caller's WebSocket connection (thread-safe)"""
     try:
         # Get connection details from thread-local storage
         connection_id = getattr(thread_local_data, 'connection_id', None)
         api_gateway_management_api = getattr(thread_local_data, 'api_gateway_management_api', None)
         
         if connection_id and api_gateway_management_api:
-            try:
-                # Send directly to the correct WebSocket connection
-                api_gateway_management_api.post_to_connection(
-                    ConnectionId=connection_id,
-                    Data=json.dumps({
-                        'type': 'trace',
-                        'content': {
-                            'trace': {
-                                'orchestrationTrace': {
-                                    'invocationInput': {
-                                        'invocationType': tool_name or 'STRANDS_TOOL',
-                                        'text': content
-                                    }
-                                }
-                            }
-                        },
-                        'agentFramework': 'StrandsSDK'
-                    })
-                )
-                logger.info(f"[STREAMING-{connection_id}] {update_type}: {content}")
-            except Exception as e:
-                logger.error(f"Error sending WebSocket message to {connection_id}: {str(e)}")
-                # Fallback to logging with connection ID
-                logger.info(f"[STREAMING-{connection_id}] {update_type}: {content} (tool: {tool_name})")
+            _trace_queue.put((connection_id, api_gateway_management_api, 'trace', {
+                'trace': {
+                    'orchestrationTrace': {
+                        'invocationInput': {
+                            'invocationType': tool_name or 'STRANDS_TOOL',
+                            'text': content
+                        }
+                    }
+                }
+            }))
+            logger.info("[STREAMING-%s] %s: %s", connection_id, update_type, content)
         else:
             # If no WebSocket connection, log the update for debugging
-            logger.info(f"[STREAMING-NO-CONNECTION] {update_type}: {content} (tool: {tool_name})")
+            logger.info("[STREAMING-NO-CONNECTION] %s: %s (tool: %s)", update_type, content, tool_name)
     except Exception as e:
         logger.error(f"Error in send_streaming_update: {str(e)}")
-        logger.info(f"[STREAMING-ERROR] {update_type}: {content} (tool: {tool_name})")
+        logger.info("[STREAMING-ERROR] %s: %s (tool: %s)", update_type, content, tool_name)
+
+# Weather code mapping for Open-Meteo (WMO codes), built once at import
+_WMO_CODES = {
+    0: "Clear sky",
+    1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
+    45: "Fog", 48: "Depositing rime fog",
+    51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
+    56: "Light freezing drizzle", 57: "Dense freezing drizzle",
+    61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
+    66: "Light freezing rain", 67: "Heavy freezing rain",
+    71: "Slight snow fall", 73: "Moderate snow fall", 75: "Heavy snow fall",
+    77: "Snow grains",
+    80: "Slight rain showers", 81: "Moderate rain showers", 82: "Violent rain showers",
+    85: "Slight snow showers", 86: "Heavy snow showers",
+    95: "Thunderstorm", 96: "Thunderstorm with slight hail", 99: "Thunderstorm with heavy hail"
+}
+_UNKNOWN_WEATHER = "Unknown weather condition"
+
+# Hazard sort order, highest risk first
+_RISK_ORDER = {'High': 3, 'Medium': 2, 'Low': 1}
+
+# Per-container TTL cache for the public API responses, shared by the prefetch pool threads
+CURRENT_WEATHER_TTL_SECONDS = 300
+DAILY_FORECAST_TTL_SECONDS = 3600
+EMERGENCY_FEED_TTL_SECONDS = 120
+_CACHE = TTLCache(maxsize=256)
 
 # Weather API tool with streaming using Open-Meteo (no API key required)
 @tool
@@ -103,8 +257,6 @@ def weather_forecast_tool(lat: str, long: str, target_datetime: str) -> str:
     Returns:
         Weather forecast information
     """
-    import urllib3
-    import json
     from datetime import datetime
     
     send_streaming_update("trace", f"🌤️ Fetching weather forecast", "weather_forecast")
@@ -124,33 +276,23 @@ def weather_forecast_tool(lat: str, long: str, target_datetime: str) -> str:
         # Format date for Open-Meteo API (YYYY-MM-DD)
         target_date = target_dt.strftime('%Y-%m-%d')
         
-        # Weather code mapping for Open-Meteo
-        def get_weather_description(weather_code):
-            weather_codes = {
-                0: "Clear sky",
-                1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
-                45: "Fog", 48: "Depositing rime fog",
-                51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
-                56: "Light freezing drizzle", 57: "Dense freezing drizzle",
-                61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
-                66: "Light freezing rain", 67: "Heavy freezing rain",
-                71: "Slight snow fall", 73: "Moderate snow fall", 75: "Heavy snow fall",
-                77: "Snow grains",
-                80: "Slight rain showers", 81: "Moderate rain showers", 82: "Violent rain showers",
-                85: "Slight snow showers", 86: "Heavy snow showers",
-                95: "Thunderstorm", 96: "Thunderstorm with slight hail", 99: "Thunderstorm with heavy hail"
-            }
-            return weather_codes.get(weather_code, "Unknown weather condition")
-        
         # Open-Meteo API URL - no API key required
         if days_diff <= 0:  # Current weather
             url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={long}&current=temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m&timezone=auto"
         else:  # Future forecast
             url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={long}&daily=temperature_2m_max,temperature_2m_min,weather_code,wind_speed_10m_max,relative_humidity_2m_mean&start_date={target_date}&end_date={target_date}&timezone=auto"
         
-        http = urllib3.PoolManager()
-        response = http.request('GET', url)
-        data = json.loads(response.data.decode('utf-8'))
+        # ~1 km grid; the date is part of the key, so entries never span a day boundary
+        is_current = days_diff <= 0
+        cache_key = ('weather', round(float(lat), 2), round(float(long), 2), target_date, is_current)
+        data = _CACHE.get(cache_key, CURRENT_WEATHER_TTL_SECONDS if is_current else DAILY_FORECAST_TTL_SECONDS)
+        if data is None:
+            response = HTTP.request('GET', url)
+            # Only successful responses are cached; errors are retried on the next call
+            if response.status != 200:
+                raise ValueError(f"Open-Meteo returned HTTP {response.status}")
+            data = jloads(response.data)
+            _CACHE.set(cache_key, data)
         
         if days_diff <= 0:  # Current weather
             current = data.get('current', {})
@@ -161,7 +303,7 @@ def weather_forecast_tool(lat: str, long: str, target_datetime: str) -> str:
                 'humidity': current.get('relative_humidity_2m', 'N/A'),
                 'wind_speed': current.get('wind_speed_10m', 'N/A'),
                 'weather_code': current.get('weather_code', 0),
-                'weather_description': get_weather_description(current.get('weather_code', 0))
+                'weather_description': _WMO_CODES.get(current.get('weather_code', 0), _UNKNOWN_WEATHER)
             }
         else:  # Future forecast
             daily = data.get('daily', {})
@@ -173,7 +315,7 @@ def weather_forecast_tool(lat: str, long: str, target_datetime: str) -> str:
                     'humidity': daily.get('relative_humidity_2m_mean', [None])[0],
                     'wind_speed': daily.get('wind_speed_10m_max', [None])[0],
                     'weather_code': daily.get('weather_code', [0])[0],
-                    'weather_description': get_weather_description(daily.get('weather_code', [0])[0])
+                    'weather_description': _WMO_CODES.get(daily.get('weather_code', [0])[0], _UNKNOWN_WEATHER)
                 }
             else:
                 return "No forecast available for the specified date"
@@ -185,7 +327,7 @@ def weather_forecast_tool(lat: str, long: str, target_datetime: str) -> str:
             weather_desc = f"{weather_info['weather_description']}, {weather_info['temperature_max']}°C/{weather_info['temperature_min']}°C"
         
         send_streaming_update("trace", f"✅ Weather: {weather_desc}", "weather_forecast")
-        return json.dumps(weather_info, indent=2)
+        return jdumps(weather_info)
         
     except Exception as e:
         logger.error(f"Error in weather_forecast_tool: {str(e)}")
@@ -207,8 +349,7 @@ def location_hazards_tool(work_order_id: str) -> str:
     
     try:
         # Get work order details
-        work_orders_table = dynamodb.Table(WORK_ORDERS_TABLE)
-        work_order_response = work_orders_table.get_item(Key={'work_order_id': work_order_id})
+        work_order_response = get_table(WORK_ORDERS_TABLE).get_item(Key={'work_order_id': work_order_id})
         
         if 'Item' not in work_order_response:
             send_streaming_update("trace", f"❌ Work order {work_order_id} not found", "location_hazards")
@@ -220,92 +361,170 @@ def location_hazards_tool(work_order_id: str) -> str:
         if not location_name:
             return "No location associated with this work order"
         
-        # Get location details
-        locations_table = dynamodb.Table(LOCATIONS_TABLE)
-        location_response = locations_table.get_item(Key={'location_name': location_name})
-        location_info = location_response.get('Item', {})
+        # Location details, location hazards and incidents depend only on location_name,
+        # so the three reads overlap instead of running back to back
+        location_future = _DDB_EXECUTOR.submit(
+            lambda: get_table(LOCATIONS_TABLE).get_item(Key={'location_name': location_name})
+        )
+        location_hazards_future = _DDB_EXECUTOR.submit(
+            lambda: get_table(LOCATION_HAZARDS_TABLE).query(
+                KeyConditionExpression=_KEY_LOCATION_NAME.eq(location_name),
+                ProjectionExpression=LOCATION_HAZARD_PROJECTION,
+                ExpressionAttributeNames={'#s': 'status'}
+            )
+        )
+        # The index is sorted by incident_date, so DynamoDB returns newest first
+        incidents_future = _DDB_EXECUTOR.submit(
+            lambda: get_table(INCIDENTS_TABLE).query(
+                IndexName='LocationDateIndex',
+                KeyConditionExpression=_KEY_LOCATION_NAME.eq(location_name),
+                ScanIndexForward=False,
+                Limit=INCIDENTS_LIMIT
+            )
+        )
+        location_hazards = location_hazards_future.result().get('Items', [])
         
-        # Get hazards for this location using location_name
-        location_hazards_table = dynamodb.Table(LOCATION_HAZARDS_TABLE)
-        hazards_table = dynamodb.Table(HAZARDS_TABLE)
-        control_measures_table = dynamodb.Table(CONTROL_MEASURES_TABLE)
+        def get_control_measures(location_hazard_id):
+            """Return the most recent control measures with the (total, active) counts for all of them"""
+            key_condition = _KEY_LOCATION_HAZARD_ID.eq(location_hazard_id)
+            control_measures = get_table(CONTROL_MEASURES_TABLE).query(
+                IndexName='LocationHazardDateIndex',
+                KeyConditionExpression=key_condition,
+                ProjectionExpression=CONTROL_MEASURE_PROJECTION,
+                ExpressionAttributeNames={'#s': 'status'},
+                ScanIndexForward=False,
+                Limit=CONTROL_MEASURES_LIMIT
+            ).get('Items', [])
+            if len(control_measures) < CONTROL_MEASURES_LIMIT:
+                return control_measures, len(control_measures), sum(
+                    1 for cm in control_measures if cm.get('status') == 'Active'
+                )
+            # The filter only applies to Count, so ScannedCount is every measure for the hazard
+            active, total = count_query(
+                CONTROL_MEASURES_TABLE,
+                IndexName='LocationHazardDateIndex',
+                KeyConditionExpression=key_condition,
+                FilterExpression='#s = :active',
+                ExpressionAttributeNames={'#s': 'status'},
+                ExpressionAttributeValues={':active': 'Active'}
+            )
+            return control_measures, total, active
         
-        # Query location hazards by location_name
-        location_hazards_response = location_hazards_table.query(
-            KeyConditionExpression=boto3.dynamodb.conditions.Key('location_name').eq(location_name)
+        # Hydrate all hazards in one round trip while the control measure queries run alongside
+        hazards_future = _DDB_EXECUTOR.submit(
+            lambda: batch_get_items(
+                get_dynamodb(), HAZARDS_TABLE, 'hazard_id', [lh['hazard_id'] for lh in location_hazards],
+                ProjectionExpression=HAZARD_PROJECTION,
+                ExpressionAttributeNames={'#d': 'description'}
+            )
         )
-        location_hazards = location_hazards_response.get('Items', [])
+        control_measures_by_hazard = list(_DDB_EXECUTOR.map(
+            get_control_measures, [lh['location_hazard_id'] for lh in location_hazards]
+        ))
+        hazards = hazards_future.result()
         
         # Enrich hazards with detailed information and control measures
-        enriched_hazards = []
-        for loc_hazard in location_hazards:
-            # Get hazard details
-            hazard_response = hazards_table.get_item(Key={'hazard_id': loc_hazard['hazard_id']})
-            hazard_details = hazard_response.get('Item', {})
-            
-            # Get control measures for this location hazard
-            control_measures_response = control_measures_table.query(
-                IndexName='LocationHazardIndex',
-                KeyConditionExpression=boto3.dynamodb.conditions.Key('location_hazard_id').eq(loc_hazard['location_hazard_id'])
-            )
-            control_measures = control_measures_response.get('Items', [])
-            
-            # Sort control measures by implementation date (most recent first)
-            control_measures.sort(key=lambda x: x.get('implementation_date', ''), reverse=True)
-            
-            enriched_hazard = {
-                'location_hazard_details': loc_hazard,
-                'hazard_details': hazard_details,
-                'control_measures': control_measures,
-                'total_control_measures': len(control_measures),
-                'active_control_measures': len([cm for cm in control_measures if cm.get('status') == 'Active'])
+        enriched_hazards = [None] * len(location_hazards)
+        for i, (loc_hazard, (control_measures, total, active)) in enumerate(zip(location_hazards, control_measures_by_hazard)):
+            enriched_hazards[i] = {
+                'location_hazard_details': drop_empty(loc_hazard),
+                'hazard_details': drop_empty(hazards.get(loc_hazard['hazard_id'], {})),
+                'control_measures': [drop_empty(cm) for cm in control_measures],
+                'total_control_measures': total,
+                'active_control_measures': active
             }
-            enriched_hazards.append(enriched_hazard)
         
         # Sort hazards by risk level (High > Medium > Low)
-        risk_level_order = {'High': 3, 'Medium': 2, 'Low': 1}
         enriched_hazards.sort(
-            key=lambda x: risk_level_order.get(x['location_hazard_details'].get('risk_level', 'Low'), 0),
+            key=lambda x: _RISK_ORDER.get(x['location_hazard_details'].get('risk_level', 'Low'), 0),
             reverse=True
         )
         
-        # Get incidents for this location using location_name
-        incidents_table = dynamodb.Table(INCIDENTS_TABLE)
-        incidents_response = incidents_table.query(
-            IndexName='LocationIndex',
-            KeyConditionExpression=boto3.dynamodb.conditions.Key('location_name').eq(location_name)
-        )
-        incidents = incidents_response.get('Items', [])
-        
-        # Sort incidents by date (most recent first)
-        incidents.sort(key=lambda x: x.get('incident_date', ''), reverse=True)
+        location_info = location_future.result().get('Item', {})
+        incidents = incidents_future.result().get('Items', [])
+        total_incidents = len(incidents)
+        if total_incidents == INCIDENTS_LIMIT:
+            total_incidents = count_query(
+                INCIDENTS_TABLE,
+                IndexName='LocationDateIndex',
+                KeyConditionExpression=_KEY_LOCATION_NAME.eq(location_name)
+            )[0]
         
         # Create summary statistics
         summary = {
             'total_hazards': len(enriched_hazards),
-            'high_risk_hazards': len([h for h in enriched_hazards if h['location_hazard_details'].get('risk_level') == 'High']),
-            'total_incidents': len(incidents),
+            'high_risk_hazards': sum(1 for h in enriched_hazards if h['location_hazard_details'].get('risk_level') == 'High'),
+            'total_incidents': total_incidents,
             'total_control_measures': sum(h['total_control_measures'] for h in enriched_hazards),
             'active_control_measures': sum(h['active_control_measures'] for h in enriched_hazards)
         }
         
         result = {
-            'work_order': work_order,
-            'location': location_info,
+            'work_order': drop_empty(work_order),
+            'location': drop_empty(location_info),
             'summary': summary,
             'hazards': enriched_hazards,
-            'incidents': incidents,
+            'incidents': [drop_empty(incident) for incident in incidents],
             'retrieved_at': datetime.utcnow().isoformat()
         }
         
         send_streaming_update("trace", f"✅ Found {summary['total_hazards']} hazards, {summary['total_incidents']} incidents", "location_hazards")
-        return json.dumps(result, indent=2, default=str)
+        return jdumps(result)
         
     except Exception as e:
         logger.error(f"Error in location_hazards_tool: {str(e)}")
         send_streaming_update("trace", f"❌ Location hazards error: {str(e)}", "location_hazards")
         return f"Error fetching location data: {str(e)}"
 
+EARTH_RADIUS_KM = 6371
+EMERGENCY_RADIUS_KM = 10
+
+# Feature properties the alert summary reads; everything else in the feed is dropped
+_ALERT_PROPERTIES = ('category1', 'status', 'title', 'location', 'sourceDateTime')
+
+def index_emergency_feed(feed_features):
+    """
+    Flatten every Point and outer Polygon ring vertex of the feed into one radians array,
+    with the owning feature's position alongside, so a lookup is a single vector pass.
+    Features are consumed one at a time and only their alert properties are kept
+    """
+    features = []
+    coords = []
+    feature_idx = []
+    for i, feature in enumerate(feed_features):
+        properties = feature.get('properties') or {}
+        features.append({'properties': {k: properties[k] for k in _ALERT_PROPERTIES if k in properties}})
+        geometry = feature.get('geometry') or {}
+        if geometry.get('type') == 'GeometryCollection':
+            geometries = geometry.get('geometries', [])
+        else:
+            geometries = [geometry]
+        for geom in geometries:
+            if geom.get('type') == 'Point':
+                coords.append(geom['coordinates'][:2])
+                feature_idx.append(i)
+            elif geom.get('type') == 'Polygon':
+                for coord in geom['coordinates'][0]:
+                    coords.append(coord[:2])
+                    feature_idx.append(i)
+    coords = np.radians(np.array(coords, dtype=np.float64).reshape(-1, 2))
+    feature_idx = np.array(feature_idx, dtype=np.int64)
+
+    # Per-feature (min_lat, max_lat, min_lon, max_lon); features without vertices stay empty
+    bbox = np.tile(np.array([np.inf, -np.inf, np.inf, -np.inf]), (len(features), 1))
+    np.minimum.at(bbox[:, 0], feature_idx, coords[:, 1])
+    np.maximum.at(bbox[:, 1], feature_idx, coords[:, 1])
+    np.minimum.at(bbox[:, 2], feature_idx, coords[:, 0])
+    np.maximum.at(bbox[:, 3], feature_idx, coords[:, 0])
+    return {
+        'features': features,
+        'coords': coords,
+        'feature_idx': feature_idx,
+        'bbox': bbox,
+        # cos(lat) per vertex, the only per-vertex haversine term that does not depend on the search point
+        'cos_lat': np.cos(coords[:, 1]),
+    }
+
 @tool
 def emergency_alerts_tool(lat: str, long: str) -> str:
     """
@@ -318,74 +537,62 @@ def emergency_alerts_tool(lat: str, long: str) -> str:
     Returns:
         Emergency alerts information
     """
-    import urllib3
-    import math
-    
     send_streaming_update("trace", f"🚨 Checking emergency alerts", "emergency_alerts")
     
+    # One timestamp for every field of this response
+    now_iso = datetime.utcnow().isoformat()
+    
     try:
-        def haversine_distance(lat1, lon1, lat2, lon2):
-            """Calculate the great circle distance between two points on earth"""
-            R = 6371  # Earth's radius in kilometers
-            
-            # Convert inputs to float
-            lat1, lon1, lat2, lon2 = map(float, [lat1, lon1, lat2, lon2])
-            lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-            
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            
-            a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-            c = 2 * math.asin(math.sqrt(a))
-            
-            return R * c
-        
-        def is_relevant(geometry, search_point):
-            """Check if geometry is within 20km of search point"""
-            if geometry['type'] == 'Point':
-                point_lon, point_lat = geometry['coordinates']
-                distance = haversine_distance(float(search_point[1]), float(search_point[0]), float(point_lat), float(point_lon))
-                return distance <= 10  # 20 km radius
-            elif geometry['type'] == 'Polygon':
-                for coord in geometry['coordinates'][0]:
-                    distance = haversine_distance(float(search_point[1]), float(search_point[0]), float(coord[1]), float(coord[0]))
-                    if distance <= 10:
-                        return True
-            return False
-        
-        search_point = (float(long), float(lat))
-        
-        # Download the GeoJSON data from Victoria Emergency Services
-        http = urllib3.PoolManager()
-        response = http.request('GET', 'https://emergency.vic.gov.au/public/events-geojson.json')
-        
-        if response.status != 200:
-            return json.dumps({
-                'location': f"Lat: {lat}, Long: {long}",
-                'alerts': [{
-                    'type': 'service_unavailable',
-                    'severity': 'info',
-                    'description': 'Emergency services data temporarily unavailable',
-                    'timestamp': datetime.utcnow().isoformat()
-                }],
-                'retrieved_at': datetime.utcnow().isoformat()
-            }, indent=2)
+        # Download the GeoJSON data from Victoria Emergency Services, reusing a recent copy
+        feed = _CACHE.get('vic_emergency_geojson', EMERGENCY_FEED_TTL_SECONDS)
+        if feed is None:
+            # Stream-parse the multi-megabyte feed feature by feature rather than holding
+            # the raw body and the whole decoded document at once
+            response = HTTP.request(
+                'GET', 'https://emergency.vic.gov.au/public/events-geojson.json', preload_content=False
+            )
+            try:
+                if response.status != 200:
+                    return jdumps({
+                        'location': f"Lat: {lat}, Long: {long}",
+                        'alerts': [{
+                            'type': 'service_unavailable',
+                            'severity': 'info',
+                            'description': 'Emergency services data temporarily unavailable',
+                            'timestamp': now_iso
+                        }],
+                        'retrieved_at': now_iso
+                    })
+                
+                feed = index_emergency_feed(ijson.items(response, 'features.item', use_float=True))
+            finally:
+                response.release_conn()
+            _CACHE.set('vic_emergency_geojson', feed)
         
-        geojson_data = json.loads(response.data.decode('utf-8'))
+        lat1, lon1 = math.radians(float(lat)), math.radians(float(long))
+        cos_lat1 = math.cos(lat1)
         
-        relevant_incidents = []
+        # Trigonometry-free bounding box test first; almost every feature is far from the site.
+        # The longitude tolerance gets a small margin over the equirectangular estimate
+        lat_tol = EMERGENCY_RADIUS_KM / EARTH_RADIUS_KM
+        lon_tol = 1.01 * lat_tol / max(cos_lat1, 1e-6)
+        bbox = feed['bbox']
+        near = ~(
+            (bbox[:, 1] < lat1 - lat_tol) | (bbox[:, 0] > lat1 + lat_tol)
+            | (bbox[:, 3] < lon1 - lon_tol) | (bbox[:, 2] > lon1 + lon_tol)
+        )
+        candidates = near[feed['feature_idx']]
+        coords = feed['coords'][candidates]
+        feature_idx = feed['feature_idx'][candidates]
         
-        for feature in geojson_data.get('features', []):
-            geometry = feature.get('geometry', {})
-            
-            if geometry.get('type') == 'GeometryCollection':
-                for geom in geometry.get('geometries', []):
-                    if is_relevant(geom, search_point):
-                        relevant_incidents.append(feature)
-                        break
-            else:
-                if is_relevant(geometry, search_point):
-                    relevant_incidents.append(feature)
+        # Haversine term for the surviving vertices at once. 2R*asin(sqrt(a)) <= r is the same
+        # test as a <= sin^2(r / 2R), so the comparison skips the sqrt and arcsin passes
+        lon2, lat2 = coords[:, 0], coords[:, 1]
+        a = np.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * feed['cos_lat'][candidates] * np.sin((lon2 - lon1) / 2) ** 2
+        a_max = math.sin(EMERGENCY_RADIUS_KM / (2 * EARTH_RADIUS_KM)) ** 2
+        # np.unique sorts, which keeps the hits in feed order
+        hits = np.unique(feature_idx[a <= a_max])
+        relevant_incidents = [feed['features'][i] for i in hits]
         
         # Format the response
         if relevant_incidents:
@@ -397,7 +604,7 @@ def emergency_alerts_tool(lat: str, long: str) -> str:
                     'severity': properties.get('status', 'unknown'),
                     'description': properties.get('title', 'Emergency incident'),
                     'location': properties.get('location', 'Location not specified'),
-                    'timestamp': properties.get('sourceDateTime', datetime.utcnow().isoformat()),
+                    'timestamp': properties.get('sourceDateTime', now_iso),
                     'source': 'Victoria Emergency Services'
                 }
                 alerts.append(alert)
@@ -407,7 +614,7 @@ def emergency_alerts_tool(lat: str, long: str) -> str:
                 'alerts': alerts,
                 'total_alerts': len(alerts),
                 'search_radius_km': 20,
-                'retrieved_at': datetime.utcnow().isoformat()
+                'retrieved_at': now_iso
             }
             
             send_streaming_update("trace", f"⚠️ Found {len(alerts)} emergency alerts", "emergency_alerts")
@@ -418,17 +625,17 @@ def emergency_alerts_tool(lat: str, long: str) -> str:
                     'type': 'all_clear',
                     'severity': 'info',
                     'description': 'No active emergency alerts for this location',
-                    'timestamp': datetime.utcnow().isoformat(),
+                    'timestamp': now_iso,
                     'source': 'Victoria Emergency Services'
                 }],
                 'total_alerts': 0,
                 'search_radius_km': 20,
-                'retrieved_at': datetime.utcnow().isoformat()
+                'retrieved_at': now_iso
             }
             
             send_streaming_update("trace", "✅ No emergency alerts found", "emergency_alerts")
         
-        return json.dumps(emergency_info, indent=2)
+        return jdumps(emergency_info)
         
     except Exception as e:
         logger.error(f"Error in emergency_alerts_tool: {str(e)}")
@@ -441,13 +648,13 @@ def emergency_alerts_tool(lat: str, long: str) -> str:
                 'type': 'service_error',
                 'severity': 'warning',
                 'description': f'Unable to retrieve emergency alerts: {str(e)}',
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': now_iso
             }],
             'error': str(e),
-            'retrieved_at': datetime.utcnow().isoformat()
+            'retrieved_at': now_iso
         }
         
-        return json.dumps(fallback_info, indent=2)
+        return jdumps(fallback_info)
         
     except Exception as e:
         logger.error(f"Error in emergency_alerts_tool: {str(e)}")
@@ -456,6 +663,51 @@ def emergency_alerts_tool(lat: str, long: str) -> str:
 
 
 
+# The three tools are independent I/O-bound lookups, so they are fetched side by side
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=3)
+
+def _in_streaming_context(fn, connection_id, api_gateway_management_api):
+    """Run fn on a pool thread with the caller's WebSocket connection, so its traces still stream"""
+    def run(*args):
+        thread_local_data.connection_id = connection_id
+        thread_local_data.api_gateway_management_api = api_gateway_management_api
+        return fn(*args)
+    return run
+
+def prefetch_tool_results(input_text: str) -> Optional[Dict[str, str]]:
+    """
+    Run all three tools concurrently when the input is a work order details JSON with
+    every tool parameter present; returns None so the agent calls the tools itself otherwise
+    """
+    try:
+        details = jloads(input_text)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(details, dict):
+        return None
+
+    work_order_id = details.get('work_order_id')
+    lat = details.get('latitude')
+    long = details.get('longitude')
+    target_datetime = details.get('target_datetime')
+    if not all([work_order_id, lat, long, target_datetime]):
+        return None
+
+    connection_id = getattr(thread_local_data, 'connection_id', None)
+    api_gateway_management_api = getattr(thread_local_data, 'api_gateway_management_api', None)
+
+    def submit(fn, *args):
+        return _PREFETCH_EXECUTOR.submit(
+            _in_streaming_context(fn, connection_id, api_gateway_management_api), *args
+        )
+
+    futures = {
+        'location_hazards_tool': submit(location_hazards_tool, str(work_order_id)),
+        'weather_forecast_tool': submit(weather_forecast_tool, str(lat), str(long), str(target_datetime)),
+        'emergency_alerts_tool': submit(emergency_alerts_tool, str(lat), str(long)),
+    }
+    return {name: future.result() for name, future in futures.items()}
+
 def create_supervisor_agent():
     """Create and configure the Strands supervisor agent with agent-as-tools pattern"""
     if not Agent or not BedrockModel:
@@ -547,6 +799,7 @@ Safety Report Supervisor | Input: WorkOrder Details JSON | Output: HTML Report
    location_hazards_tool - Call with only work_order_id to retrieve hazards for a work order location
    weather_forecast_tool - Call with latitude, longitude and target_datetime to retrieve weather forecast
    emergency_alerts_tool - Call with latitude, longitude to retrieve emergency warnings/alerts
+   If the input contains <prefetched_tool_results>, those are the results of these three calls: use them and do not call the tools again.
 3. Create a comprehensive HTML safety report based on all agent analyses
 </workflow>
 
@@ -587,15 +840,121 @@ You must format your final report using this exact HTML structure:
     
     return supervisor_agent
 
+# Built once per execution environment; Lambda runs one invocation at a time per environment
+_SUPERVISOR_AGENT = None
+
+def get_supervisor_agent():
+    """Return the shared supervisor agent, cleared of the previous invocation's conversation"""
+    global _SUPERVISOR_AGENT
+    if _SUPERVISOR_AGENT is None:
+        _SUPERVISOR_AGENT = create_supervisor_agent()
+    else:
+        # Every safety report is independent, so no history carries over between requests
+        _SUPERVISOR_AGENT.messages = []
+    return _SUPERVISOR_AGENT
+
+# Pay the model and agent construction during the cold start instead of the first request
+try:
+    get_supervisor_agent()
+except Exception as e:
+    logger.error(f"Failed to create supervisor agent at init: {str(e)}")
+
+# Response shapes, remembered per response class so warm invocations skip the probing
+_SHAPE_CONTENT, _SHAPE_MESSAGE, _SHAPE_STR = 0, 1, 2
+_MAX_RESPONSE_SHAPES = 8
+_response_shapes = {}
+
+def _probe_response_content(response):
+    """Find the content array by probing the response, reading each attribute once"""
+    try:
+        content = response.content
+        if not isinstance(content, list):
+            raise AttributeError("content")
+        # Strands format: response.content is an array of content items
+        logger.debug("Found response.content array with %d items", len(content))
+        return _SHAPE_CONTENT, content
+    except AttributeError:
+        try:
+            # Fallback: use message attribute - wrap in content array format
+            content = [{"text": response.message}]
+            logger.info("Using response.message as fallback")
+            return _SHAPE_MESSAGE, content
+        except AttributeError:
+            # Last resort: stringify the response - wrap in content array format
+            logger.info("Using stringified response as last resort")
+            return _SHAPE_STR, [{"text": str(response)}]
+
+def extract_response_content(response):
+    """Return the response as a content array, using the shape already seen for its class"""
+    shape = _response_shapes.get(type(response))
+    if shape == _SHAPE_CONTENT:
+        content = getattr(response, 'content', None)
+        # Lambda does not run with -O, so a non-list is re-probed instead of asserted
+        if isinstance(content, list):
+            return content
+    elif shape == _SHAPE_MESSAGE:
+        try:
+            return [{"text": response.message}]
+        except AttributeError:
+            pass
+    elif shape == _SHAPE_STR:
+        return [{"text": str(response)}]
+    
+    # First response of this class, or the instance did not fit the remembered shape
+    shape, content = _probe_response_content(response)
+    if len(_response_shapes) < _MAX_RESPONSE_SHAPES:
+        _response_shapes[type(response)] = shape
+    return content
+
+# API Gateway bodies above this size are gzipped for clients that accept it; level 1 is
+# nearly free in CPU and still shrinks report JSON several times over
+GZIP_MIN_BYTES = 1024
+
+def build_response(status_code, body, event, direct_invocation):
+    """
+    Wrap the response body for the caller: direct invokes get the object itself so the
+    Lambda runtime encodes it once, API Gateway gets a JSON string, compressed when large
+    """
+    if direct_invocation:
+        return {'statusCode': status_code, 'body': body}
+    
+    body_json = jdumps(body)
+    headers = event.get('headers') or {}
+    accept_encoding = next((value for key, value in headers.items() if key.lower() == 'accept-encoding'), '')
+    body_bytes = body_json.encode('utf-8')
+    if len(body_bytes) > GZIP_MIN_BYTES and 'gzip' in (accept_encoding or ''):
+        return {
+            'statusCode': status_code,
+            'isBase64Encoded': True,
+            'headers': {'Content-Encoding': 'gzip', 'Content-Type': 'application/json'},
+            'body': base64.b64encode(gzip.compress(body_bytes, compresslevel=1)).decode('ascii')
+        }
+    return {'statusCode': status_code, 'body': body_json}
+
+async def stream_supervisor_response(supervisor_agent, input_text):
+    """Run the agent through stream_async, forwarding text deltas, and return the final result"""
+    result = None
+    async for event in supervisor_agent.stream_async(input_text):
+        if "data" in event:
+            send_streaming_chunk(event["data"])
+        elif "result" in event:
+            result = event["result"]
+    return result
+
 def lambda_handler(event, context):
     """
     Lambda handler for Strands supervisor agent with streaming support
     """
-    logger.info(f"Received event: {json.dumps(event, default=str)}")
+    logger.info("Received event: %s", event)
     
     # Global WebSocket connection setup (Strands-specific) - using thread-local storage for security
     global thread_local_data
     
+    # One timestamp for whichever response this invocation returns
+    request_timestamp = datetime.now(timezone.utc).isoformat()
+    # Direct invokes (the WebSocket handler) take the body as an object, see build_response
+    direct_invocation = 'inputText' in event
+    
     try:
         # Handle different event sources
         if 'inputText' in event:
@@ -607,7 +966,7 @@ def lambda_handler(event, context):
             api_gateway_endpoint = event.get('apiGatewayEndpoint')
         elif 'body' in event:
             # API Gateway invocation
-            body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
+            body = jloads(event['body']) if isinstance(event['body'], str) else event['body']
             input_text = body.get('inputText', body.get('message', ''))
             session_id = body.get('sessionId', 'default-session')
             enable_streaming = body.get('enableStreaming', False)
@@ -615,7 +974,7 @@ def lambda_handler(event, context):
             api_gateway_endpoint = body.get('apiGatewayEndpoint')
         else:
             # Direct message
-            input_text = event.get('message', json.dumps(event))
+            input_text = event.get('message', jdumps(event))
             session_id = event.get('sessionId', 'default-session')
             enable_streaming = event.get('enableStreaming', False)
             connection_id = event.get('connectionId')
@@ -624,7 +983,7 @@ def lambda_handler(event, context):
         if not input_text:
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': 'No input text provided'})
+                'body': jdumps({'error': 'No input text provided'})
             }
         
         # Set up WebSocket connection for direct streaming (Strands-specific) - thread-safe
@@ -633,14 +992,15 @@ def lambda_handler(event, context):
                 # Initialize API Gateway Management API client for direct WebSocket communication
                 api_gateway_management_api = boto3.client(
                     'apigatewaymanagementapi',
-                    endpoint_url=api_gateway_endpoint
+                    endpoint_url=api_gateway_endpoint,
+                    config=AWS_CLIENT_CONFIG
                 )
                 
                 # Store connection details in thread-local storage (secure for concurrent users)
                 thread_local_data.connection_id = connection_id
                 thread_local_data.api_gateway_management_api = api_gateway_management_api
                 
-                logger.info(f"WebSocket streaming enabled for connection: {connection_id}")
+                logger.info("WebSocket streaming enabled for connection: %s", connection_id)
             except Exception as e:
                 logger.error(f"Error setting up WebSocket connection: {str(e)}")
                 # Clear thread-local data on error
@@ -654,62 +1014,53 @@ def lambda_handler(event, context):
         # Send initial trace
         send_streaming_update("trace", "🚀 Initializing Safety Supervisor", "supervisor")
         
-        # Create supervisor agent
-        supervisor_agent = create_supervisor_agent()
+        # Reuse the supervisor agent built at init
+        supervisor_agent = get_supervisor_agent()
         
         # Process the request
-        logger.info(f"Processing input: {input_text[:100]}...")
+        logger.info("Processing input: %.100s...", input_text)
         
-        response = supervisor_agent(input_text)
+        # Fetch the tool results concurrently up front, so the model only has to write the report
+        prefetched = prefetch_tool_results(input_text)
+        if prefetched:
+            input_text = (
+                f"{input_text}\n\n<prefetched_tool_results>\n"
+                f"{jdumps(prefetched)}\n"
+                f"</prefetched_tool_results>"
+            )
         
-        # Extract response content based on Strands response format
-        response_content = None
+        # Stream the report to the WebSocket as it is generated instead of after it completes
+        response = asyncio.run(stream_supervisor_response(supervisor_agent, input_text))
         
         # Log the raw response for debugging
-        logger.info(f"Raw Strands response type: {type(response)}")
-        logger.info(f"Raw Strands response: {response}")
-        
-        # Handle the actual Strands response object structure
-        if hasattr(response, 'content') and isinstance(response.content, list):
-            # Strands format: response.content is an array of content items
-            logger.info(f"Found response.content array with {len(response.content)} items")
-            response_content = response.content
-        elif hasattr(response, 'message'):
-            # Fallback: use message attribute - wrap in content array format
-            logger.info("Using response.message as fallback")
-            response_content = [{"text": response.message}]
-        else:
-            # Last resort: stringify the response - wrap in content array format
-            logger.info("Using stringified response as last resort")
-            response_content = [{"text": str(response)}]
+        logger.debug("Raw Strands response type: %s", type(response))
+        logger.debug("Raw Strands response: %s", response)
         
-        # Format response to match the structure you showed: {"role":"assistant","content":[{"text":"..."}]}
-        formatted_response = {
-            "role": "assistant",
-            "content": response_content
-        }
+        # Extract response content based on Strands response format
+        response_content = extract_response_content(response)
         
-        # Format final result
-        result = {
-            'statusCode': 200,
-            'body': json.dumps({
-                'sessionId': session_id,
-                'response': formatted_response,  # Send the full structured response
-                'timestamp': datetime.utcnow().isoformat(),
-                'framework': 'StrandsSDK'
-            })
+        # Format final result; the response keeps the {"role":"assistant","content":[{"text":"..."}]} shape
+        body = {
+            'sessionId': session_id,
+            'response': {'role': 'assistant', 'content': response_content},
+            'timestamp': request_timestamp,
+            'framework': 'StrandsSDK'
         }
+        result = build_response(200, body, event, direct_invocation)
         
-        logger.info(f"Generated response with content array length: {len(response_content) if response_content else 0}")
+        logger.debug("Generated response with content array length: %d", len(response_content))
         return result
         
-    except Exception as e:
-        logger.error(f"Error processing request: {str(e)}")
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'error': f'Error processing request: {str(e)}',
-                'timestamp': datetime.utcnow().isoformat(),
-                'framework': 'StrandsSDK'
-            })
+    except Exception:
+        # Full detail with traceback stays in the logs; callers only get a reference to it
+        logger.exception("Error processing request")
+        body = {
+            'error': 'Internal error',
+            'requestId': getattr(context, 'aws_request_id', None),
+            'timestamp': request_timestamp,
+            'framework': 'StrandsSDK'
         }
+        return build_response(500, body, event, direct_invocation)
+    finally:
+        # The execution environment freezes once the handler returns, so drain the traces first
+        flush_streaming_updates()
@@ -0,0 +1,40 @@
+import threading
+import time
+
+
+class TTLCache:
+    """Per-container cache whose entries expire after a caller-supplied TTL"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = {}
+        # Tools may run on worker threads, so every access to the entries is locked
+        self._lock = threading.Lock()
+
+    def get(self, key, ttl):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+
+    def peek(self, key):
+        """Return the stored value even if it has expired, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic(), value)
+            # Dicts keep insertion order, so the first key is the oldest entry
+            while len(self._entries) > self.maxsize:
+                del self._entries[next(iter(self._entries))]
+
+    def get_or_fetch(self, key, ttl, fetch):
+        value = self.get(key, ttl)
+        if value is None:
+            value = fetch()
+            self.set(key, value)
+        return value
@@ -55,10 +55,32 @@ const WebSocketSafetyCheck: React.FC<WebSocketSafetyCheckProps> = ({
           // Process trace message based on agent framework
           handleTraceMessage(message);
           break;
+        case 'trace_batch':
+          // Traces can arrive coalesced into one frame; process each as a single trace
+          if (Array.isArray(webSocketMessage.content)) {
+            webSocketMessage.content.forEach((trace: any) => {
+              handleTraceMessage({ type: 'trace', content: trace, agentFramework: webSocketMessage.agentFramework });
+            });
+          }
+          break;
         case 'final':
           // Process final message (works for both Bedrock Agent and Strands)
           handleFinalMessage(webSocketMessage);
           break;
+        case 'batchReport':
+          // Batch reports arrive one per work order as each run finishes
+          if (webSocketMessage.workOrderId === workOrder?.work_order_id) {
+            handleFinalMessage({ ...webSocketMessage, type: 'final' });
+          }
+          break;
+        case 'batchFinal':
+          // Work orders the batch ran out of time for have to be checked again
+          if (workOrder?.work_order_id && webSocketMessage.skippedWorkOrderIds?.includes(workOrder.work_order_id)) {
+            setIsProcessing(false);
+            setIsConnecting(false);
+            onSafetyCheckError('The batch ran out of time before this work order; please run its safety check again');
+          }
+          break;
         case 'error':
           // Reset states on error
           setIsProcessing(false);
@@ -81,7 +103,7 @@ const WebSocketSafetyCheck: React.FC<WebSocketSafetyCheckProps> = ({
         timeoutRef.current = null;
       }
     };
-  }, [onSafetyCheckComplete, onSafetyCheckError]);
+  }, [onSafetyCheckComplete, onSafetyCheckError, workOrder?.work_order_id]);
 
   const handleTraceMessage = (message: WebSocketMessage) => {
     // Extract the actual message content (handle nested structure)
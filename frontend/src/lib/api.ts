@@ -38,7 +38,7 @@ export interface WorkOrder {
 
 // WebSocket message interface
 export interface WebSocketMessage {
-  type: 'chunk' | 'trace' | 'status' | 'final' | 'error';
+  type: 'chunk' | 'trace' | 'trace_batch' | 'status' | 'final' | 'batchReport' | 'batchFinal' | 'error';
   content?: string | any;
   message?: string | WebSocketMessage;  // Handle nested message structure
   status?: string;
@@ -47,6 +47,8 @@ export interface WebSocketMessage {
   safetyCheckResponse?: string;
   safetyCheckPerformedAt?: string;
   agentFramework?: string;  // Add agent framework information
+  workOrderId?: string;  // Work order a batchReport message belongs to
+  skippedWorkOrderIds?: string[];  // Batch work orders that did not fit in the invocation time
 }
 
 // Use runtime config instead of env variables